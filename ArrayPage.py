@@ -1,15 +1,34 @@
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, 
                             QHBoxLayout, QPushButton,
                             QLabel, QTextEdit,
-                            QLineEdit, QMessageBox)
+                            QLineEdit, QMessageBox, QComboBox,
+                            QFileDialog, QInputDialog)
 from PyQt6.QtGui import QFont, QIntValidator
 
+from algoritmos import (sort, binary_search, search_many, sorted_insert,
+                        sorted_remove, SORT_ENGINES)
+from estructuras import IntArray, BlockList, MappedIntArray, np
+import os
+
 
 class ArrayPage(QWidget):
+    # Max number of values shown in the display
+    DISPLAY_LIMIT = 200
+    # Storage backends for the array
+    STORAGES = {"Lista": list, "Bloques": BlockList}
+    if np is not None:
+        STORAGES["NumPy int64"] = IntArray
+    STORAGES["Archivo (mmap)"] = MappedIntArray
+    # Persistent account registry used by the "Archivo (mmap)" storage
+    ACCOUNTS_FILE = "cuentas.bin"
+
     def __init__(self):
         super().__init__()
-        self.array = []
+        self.storage = list
+        self.array = self._new_array()
         self.sorted = False
+        # In sorted mode new values go straight to their ordered position
+        self.sorted_mode = False
         
         layout = QVBoxLayout()
         
@@ -53,6 +72,11 @@ class ArrayPage(QWidget):
         delete_btn.setStyleSheet("background-color: #e74c3c; color: white; padding: 10px;")
         input_layout.addWidget(delete_btn)
         
+        delete_value_btn = QPushButton("Eliminar valor")
+        delete_value_btn.clicked.connect(self.delete_value)
+        delete_value_btn.setStyleSheet("background-color: #c0392b; color: white; padding: 10px;")
+        input_layout.addWidget(delete_value_btn)
+        
         layout.addLayout(input_layout)
         
         button_layout = QHBoxLayout()
@@ -61,12 +85,42 @@ class ArrayPage(QWidget):
         search_btn.clicked.connect(self.binary_search)
         search_btn.setStyleSheet("background-color: #f1c40f; color: black; padding: 10px;")
         button_layout.addWidget(search_btn)
+        
+        batch_search_btn = QPushButton("Búsqueda por lote")
+        batch_search_btn.clicked.connect(self.batch_search)
+        batch_search_btn.setStyleSheet("background-color: #f39c12; color: black; padding: 10px;")
+        button_layout.addWidget(batch_search_btn)
+        
+        batch_file_btn = QPushButton("Búsqueda por archivo")
+        batch_file_btn.clicked.connect(self.batch_search_file)
+        batch_file_btn.setStyleSheet("background-color: #f39c12; color: black; padding: 10px;")
+        button_layout.addWidget(batch_file_btn)
 
-        sort_btn = QPushButton("Ordenamiento Shell")
-        sort_btn.clicked.connect(self.shell_sort)
+        self.sort_engine = QComboBox()
+        self.sort_engine.addItems(SORT_ENGINES.keys())
+        button_layout.addWidget(self.sort_engine)
+        
+        sort_btn = QPushButton("Ordenar")
+        sort_btn.clicked.connect(self.sort_array)
         sort_btn.setStyleSheet("background-color: #3498db; color: white; padding: 10px;")
         button_layout.addWidget(sort_btn)
         
+        self.sorted_mode_btn = QPushButton("Modo ordenado")
+        self.sorted_mode_btn.setCheckable(True)
+        self.sorted_mode_btn.toggled.connect(self.toggle_sorted_mode)
+        self.sorted_mode_btn.setStyleSheet("background-color: #8e44ad; color: white; padding: 10px;")
+        button_layout.addWidget(self.sorted_mode_btn)
+        
+        self.storage_input = QComboBox()
+        self.storage_input.addItems(self.STORAGES.keys())
+        self.storage_input.currentTextChanged.connect(self.change_storage)
+        button_layout.addWidget(self.storage_input)
+        
+        load_btn = QPushButton("Cargar archivo")
+        load_btn.clicked.connect(self.load_file)
+        load_btn.setStyleSheet("background-color: #2980b9; color: white; padding: 10px;")
+        button_layout.addWidget(load_btn)
+        
         clear_btn = QPushButton("Limpiar Arreglo")
         clear_btn.clicked.connect(self.clear_array)
         clear_btn.setStyleSheet("background-color: #95a5a6; color: white; padding: 10px;")
@@ -85,6 +139,10 @@ class ArrayPage(QWidget):
         
         layout.addStretch()
         self.setLayout(layout)
+        
+        # Reopen the saved registry, mapping the file is instant at any size
+        if os.path.exists(self.ACCOUNTS_FILE):
+            self.storage_input.setCurrentText("Archivo (mmap)")
         self.update_display()
     
     def add_element(self):
@@ -92,9 +150,12 @@ class ArrayPage(QWidget):
         if value:
             try:
                 int_value = int(value)
-                self.array.append(int_value)
+                if self.sorted_mode:
+                    sorted_insert(self.array, int_value)
+                else:
+                    self.sorted = self._keeps_order(len(self.array), int_value)
+                    self.array.append(int_value)
                 self.array_input.clear()
-                self.sorted = False
                 self.update_display()
             except ValueError:
                 QMessageBox.warning(self, "Valor Ingresado Inválido", "Porfavor ingrese un número entero")
@@ -118,10 +179,16 @@ class ArrayPage(QWidget):
             index = int(index_str)
             
             if 0 <= index <= len(self.array):
+                keeps_order = self._keeps_order(index, int_value)
+                if self.sorted_mode and not keeps_order:
+                    QMessageBox.warning(self, "Modo ordenado", 
+                                        "En ese índice el arreglo dejaría de estar ordenado.\n"
+                                        "Use Añadir para colocar el valor en su posición.")
+                    return
+                self.sorted = keeps_order
                 self.array.insert(index, int_value)
                 self.array_input.clear()
                 self.index_input.clear()
-                self.sorted = False
                 self.update_display()
             else:
                 QMessageBox.warning(self, "Índice inválido", f"El valor del Índice debe encontrarse en medio de 0 y {len(self.array)}")
@@ -138,9 +205,9 @@ class ArrayPage(QWidget):
         try:
             index = int(index_str)
             if 0 <= index < len(self.array):
+                # Removing a value never breaks the order
                 removed = self.array.pop(index)
                 self.index_input.clear()
-                self.sorted = False
                 QMessageBox.information(self, "Eliminado", f"Valor Eliminado: {removed}")
                 self.update_display()
             else:
@@ -151,16 +218,172 @@ class ArrayPage(QWidget):
         except ValueError:
             QMessageBox.warning(self, "Valor inválido", "Índice debe ser entero")
     
+    def delete_value(self):
+        value = self.array_input.text().strip()
+        if not value:
+            QMessageBox.warning(self, "Valor vacío", "Ingrese el valor a eliminar")
+            return
+        
+        try:
+            int_value = int(value)
+        except ValueError:
+            QMessageBox.warning(self, "Valor inválido", "El valor tiene que ser entero.")
+            return
+        
+        # Sorted arrays are searched in O(log n), otherwise a linear scan
+        if self.sorted:
+            index = sorted_remove(self.array, int_value)
+        else:
+            index = next((i for i, v in enumerate(self.array) if v == int_value), -1)
+            if index != -1:
+                self.array.pop(index)
+        
+        if index == -1:
+            QMessageBox.information(self, "No encontrado", 
+                                    f"El valor {int_value} no fue encontrado en el arreglo.")
+            return
+        
+        self.array_input.clear()
+        self.update_display()
+        QMessageBox.information(self, "Eliminado", f"Valor {int_value} eliminado del índice {index}")
+    
     def clear_array(self):
-        self.array = []
-        self.sorted = False
+        self.array.clear()
+        self.sorted = self.sorted_mode
+        self.update_display()
+    
+    # Would inserting value at index keep an already sorted array sorted?
+    def _keeps_order(self, index, value):
+        if not self.sorted:
+            return False
+        if index > 0 and self.array[index - 1] > value:
+            return False
+        if index < len(self.array) and self.array[index] < value:
+            return False
+        return True
+    
+    def toggle_sorted_mode(self, checked):
+        self.sorted_mode = checked
+        if checked and not self.sorted:
+            self._resort()
+            self.sorted = True
+        self.update_display()
+    
+    def _new_array(self, values=()):
+        if self.storage is MappedIntArray:
+            return self._open_account_file(values)
+        return self.storage(values)
+    
+    # The saved registry wins; an empty file is seeded with the current values
+    def _open_account_file(self, values):
+        array = MappedIntArray(self.ACCOUNTS_FILE)
+        if len(array) == 0:
+            try:
+                array.extend(values)
+            except OverflowError:
+                array.close()
+                raise
+            array.sorted = self.sorted
+        elif len(values):
+            QMessageBox.warning(self, "Registro existente", 
+                                f"{self.ACCOUNTS_FILE} ya tiene {len(array)} cuentas guardadas.\n"
+                                f"Los {len(values)} valores en memoria no se copiaron al archivo.")
+        return array
+    
+    # Internal re-sort, no stats needed: NumPy when the storage allows it,
+    # otherwise a plain built-in sort of the values
+    def _resort(self):
+        if self.storage is IntArray or (self.storage is MappedIntArray and np is not None):
+            sort(self.array, "numpy")
+        elif isinstance(self.array, list):
+            self.array.sort()
+        else:
+            values = self.array.tolist()
+            values.sort()
+            self.array[:] = values
+    
+    def change_storage(self, name):
+        old_array = self.array
+        self.storage = self.STORAGES[name]
+        try:
+            self.array = self._new_array(old_array)
+        except OverflowError:
+            # Lists and blocks hold any integer, NumPy and the file only int64
+            QMessageBox.warning(self, "Valor fuera de rango", 
+                                f"{name} solo admite enteros de 64 bits")
+            self._restore_storage(old_array)
+            return
+        except (OSError, ValueError) as e:
+            QMessageBox.warning(self, "Error", f"No se pudo abrir el almacenamiento: {str(e)}")
+            self._restore_storage(old_array)
+            return
+        if isinstance(old_array, MappedIntArray):
+            old_array.close()
+        if isinstance(self.array, MappedIntArray):
+            self.sorted = self.array.sorted
+            # An unsorted registry is sorted on open while sorted mode is on
+            if self.sorted_mode and not self.sorted:
+                self._resort()
+                self.sorted = True
+        # NumPy storage is always sorted with np.sort
+        self.sort_engine.setEnabled(self.storage is not IntArray)
+        self.update_display()
+    
+    def _restore_storage(self, old_array):
+        self.storage = type(old_array)
+        self.storage_input.blockSignals(True)
+        self.storage_input.setCurrentText(next(k for k, v in self.STORAGES.items() if v is self.storage))
+        self.storage_input.blockSignals(False)
+    
+    # Ask for a file of account numbers, None if cancelled or unreadable
+    def _read_values_file(self, title):
+        path, _ = QFileDialog.getOpenFileName(self, title, "", "Texto (*.txt *.csv);;Todos (*)")
+        if not path:
+            return None
+        
+        try:
+            with open(path, encoding="utf-8") as file:
+                return [int(token) for line in file for token in line.replace(",", " ").split()]
+        except ValueError:
+            QMessageBox.warning(self, "Valor inválido", "El archivo solo debe contener números enteros")
+        except OSError as e:
+            QMessageBox.warning(self, "Error", f"No se pudo leer el archivo: {str(e)}")
+        return None
+    
+    def load_file(self):
+        values = self._read_values_file("Cargar números de cuenta")
+        if values is None:
+            return
+        
+        # One bulk append, vectorized with NumPy storage; int64 storages
+        # convert the whole batch first, so a bad value adds nothing
+        try:
+            self.array.extend(values)
+        except OverflowError:
+            QMessageBox.warning(self, "Valor fuera de rango", 
+                                f"{self.storage_input.currentText()} solo admite enteros de 64 bits.\n"
+                                "No se añadió ningún valor del archivo.")
+            return
+        if self.sorted_mode:
+            self._resort()
+        else:
+            self.sorted = False
         self.update_display()
+        QMessageBox.information(self, "Cargado", f"{len(values)} números de cuenta añadidos")
     
     def update_display(self):
+        # Keep the sorted flag in the file header and write the edits to disk
+        if isinstance(self.array, MappedIntArray):
+            self.array.sorted = self.sorted
+            self.array.flush()
+        
         if self.array:
-            indices = "Índices: " + " ".join([f"[{i}]" for i in range(len(self.array))]) + "\n"
-            values = "Valores:  " + " ".join([f"[{v}]" for v in self.array])
+            shown = min(len(self.array), self.DISPLAY_LIMIT)
+            indices = "Índices: " + " ".join([f"[{i}]" for i in range(shown)]) + "\n"
+            values = "Valores:  " + " ".join([f"[{self.array[i]}]" for i in range(shown)])
             display = indices + values
+            if len(self.array) > shown:
+                display += f" ... ({len(self.array) - shown} más)"
         else:
             display = "Arreglo vacío"
         
@@ -169,7 +392,7 @@ class ArrayPage(QWidget):
         sorted_status = "Ordenado ✓" if self.sorted else "Desordenado"
         self.array_info.setText(f"Tamaño: {len(self.array)} | Se encuentra: {sorted_status}")
 
-    def shell_sort(self):
+    def sort_array(self):
         if len(self.array) == 0:
             QMessageBox.warning(self, "Arreglo Vacío", "el arreglo está vacío")
             return
@@ -180,22 +403,16 @@ class ArrayPage(QWidget):
             QMessageBox.information(self, "Ordenado", "El arreglo solo tiene un elemento, ya se encuentra ordenado.")
             return
         
-        array_len = len(self.array)
-        gap = array_len // 2
-        
-        while gap > 0:
-            for i in range(gap, array_len):
-                temp = self.array[i]
-                j = i
-                while j >= gap and self.array[j - gap] > temp:
-                    self.array[j] = self.array[j - gap]
-                    j -= gap
-                self.array[j] = temp
-            gap //= 2
+        engine = "numpy" if self.storage is IntArray else self.sort_engine.currentText()
+        stats = sort(self.array, engine)
         
         self.sorted = True
         self.update_display()
-        QMessageBox.information(self, "Ordenado", "El arreglo ha sido ordenado pormedio de Shell Sort.")
+        QMessageBox.information(self, "Ordenado", 
+                                f"El arreglo ha sido ordenado por medio de {engine}.\n\n"
+                                f"Comparaciones: {stats.comparisons}\n"
+                                f"Movimientos: {stats.moves}\n"
+                                f"Tiempo: {stats.seconds * 1000:.3f} ms")
 
     def binary_search(self):
         if len(self.array) == 0:
@@ -204,7 +421,7 @@ class ArrayPage(QWidget):
         
         if not self.sorted:
             QMessageBox.warning(self, "Arreglo desordenado", 
-                                    "El arreglo debe estar ordenado primero\nHaga click en Shell para ordenarlo.")
+                                    "El arreglo debe estar ordenado primero\nHaga click en Ordenar para ordenarlo.")
             return
         
         value = self.array_input.text().strip()
@@ -219,21 +436,61 @@ class ArrayPage(QWidget):
             QMessageBox.warning(self, "Valor inválido", "El valor tiene que ser entero.")
             return
         
-        left = 0
-        right = len(self.array) - 1
+        index = binary_search(self.array, search_value)
         
-        while left <= right:
-            mid = (left + right) // 2
-            
-            if self.array[mid] == search_value:
-                self.array_input.clear()
-                QMessageBox.information(self, "Encontrado", 
-                                    f"Valor {search_value} encontrado en índice: {mid}")
-                return
-            elif self.array[mid] < search_value:
-                left = mid + 1
-            else:
-                right = mid - 1
+        if index != -1:
+            self.array_input.clear()
+            QMessageBox.information(self, "Encontrado", 
+                                f"Valor {search_value} encontrado en índice: {index}")
+            return
         
         QMessageBox.information(self, "Not Encontrado", 
-                            f"El valor {search_value} no fue encontrado en el arreglo.")
\ No newline at end of file
+                            f"El valor {search_value} no fue encontrado en el arreglo.")
+    
+    def _can_batch_search(self):
+        if len(self.array) == 0:
+            QMessageBox.warning(self, "Arreglo vacío", "El arreglo está vacío")
+            return False
+        
+        if not self.sorted:
+            QMessageBox.warning(self, "Arreglo desordenado", 
+                                    "El arreglo debe estar ordenado primero\nHaga click en Ordenar para ordenarlo.")
+            return False
+        return True
+    
+    def batch_search(self):
+        if not self._can_batch_search():
+            return
+        
+        text, ok = QInputDialog.getMultiLineText(self, "Búsqueda por lote", 
+                                                 "Pegue los números de cuenta (separados por espacios, comas o líneas):")
+        if not ok or not text.strip():
+            return
+        
+        try:
+            queries = [int(token) for token in text.replace(",", " ").split()]
+        except ValueError:
+            QMessageBox.warning(self, "Valor inválido", "Todos los valores tienen que ser enteros.")
+            return
+        
+        self._show_batch_results(queries)
+    
+    def batch_search_file(self):
+        if not self._can_batch_search():
+            return
+        
+        queries = self._read_values_file("Buscar números de cuenta")
+        if queries:
+            self._show_batch_results(queries)
+    
+    def _show_batch_results(self, queries):
+        results = search_many(self.array, queries)
+        found = sum(1 for _, index in results if index != -1)
+        
+        # One summary instead of a dialog per value
+        details = "\n".join(f"{value}: índice {index}" if index != -1 else f"{value}: no encontrado"
+                            for value, index in results[:self.DISPLAY_LIMIT])
+        if len(results) > self.DISPLAY_LIMIT:
+            details += f"\n... ({len(results) - self.DISPLAY_LIMIT} más)"
+        QMessageBox.information(self, "Resultado de búsqueda por lote", 
+                                f"Encontrados: {found} | No encontrados: {len(results) - found}\n\n{details}")
\ No newline at end of file
@@ -1,50 +1,121 @@
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, 
                             QHBoxLayout, QPushButton, QLabel,
-                            QLineEdit, QMessageBox, QScrollArea)
+                            QLineEdit, QMessageBox, QScrollArea,
+                            QFileDialog, QComboBox)
 from PyQt6.QtGui import QFont, QPainter, QPen, QBrush, QColor, QIntValidator
 from PyQt6.QtCore import Qt
-import math
+from itertools import islice
 
-from Estructuras import Tree
+from estructuras import Tree, AVLTree, CompactTree
+from persistencia import PersistentStore
 
 
 class BinaryTreeCanvas(QWidget):
+    NODE_SPACING = 50   # Min horizontal distance between two nodes
+    LEVEL_SPACING = 70
+    MARGIN = 50
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setMinimumSize(1200, 700)  # Larger canvas
         self.tree_nodes = []
         self.positions = {}
         
+    # nodes are the (value, parent_index, depth, order) records from Tree.layout()
     def set_tree_data(self, nodes):
         self.tree_nodes = nodes
         self.calculate_positions()
         self.update()
     
     def calculate_positions(self):
+        self.positions = {}
         if not self.tree_nodes:
-            self.positions = {}
+            self.setMinimumSize(1200, 700)
             return
         
-        self.positions = {}
-        max_level = self._calculate_level(len(self.tree_nodes) - 1)
+        offsets = self._tidy_offsets()
+        
+        # Parents come before children in the records, so one pass is enough
+        xs = [0.0] * len(self.tree_nodes)
+        for i, (_, parent, _, _) in enumerate(self.tree_nodes):
+            if parent is not None:
+                xs[i] = xs[parent] + offsets[i]
+        
+        min_x = min(xs)
+        tree_width = max(xs) - min_x
+        max_depth = max(depth for _, _, depth, _ in self.tree_nodes)
         
-        # Dynamic sizing based on tree depth
-        vertical_spacing = min(70, 500 // (max_level + 1))
+        # Grow the canvas (inside the scroll area) to fit the tree
+        self.setMinimumSize(max(1200, int(tree_width) + 2 * self.MARGIN),
+                            max(700, max_depth * self.LEVEL_SPACING + 2 * self.MARGIN))
+        left = max(self.MARGIN, (max(self.width(), self.minimumWidth()) - tree_width) / 2)
         
-        for i, node_value in enumerate(self.tree_nodes):
-            if node_value is None:
+        for i, (_, _, depth, _) in enumerate(self.tree_nodes):
+            self.positions[i] = (int(left + xs[i] - min_x), self.MARGIN + depth * self.LEVEL_SPACING)
+    
+    # Reingold–Tilford style tidy layout in O(n): each pair of sibling subtrees
+    # is pushed apart only as much as their shared contour levels need.
+    # Returns the x offset of every node relative to its parent.
+    def _tidy_offsets(self):
+        n = len(self.tree_nodes)
+        children = [[None, None] for _ in range(n)]
+        for i, (_, parent, _, order) in enumerate(self.tree_nodes):
+            if parent is not None:
+                side = 0 if order < self.tree_nodes[parent][3] else 1
+                children[parent][side] = i
+        
+        offsets = [0.0] * n
+        # Subtree contours as (x list from deepest level up, shift)
+        left_contours = [None] * n
+        right_contours = [None] * n
+        
+        # Reverse pre-order visits children before their parent
+        for i in range(n - 1, -1, -1):
+            left, right = children[i]
+            if left is None and right is None:
+                left_contours[i] = ([0.0], 0.0)
+                right_contours[i] = ([0.0], 0.0)
                 continue
             
-            level = self._calculate_level(i)
-            pos_in_level = i - (2**level - 1)
-            nodes_at_level = 2 ** level
-            
-            # Calculate x position with dynamic spacing
-            spacing = self.width() // (nodes_at_level + 1)
-            x = spacing * (pos_in_level + 1)
-            y = 50 + level * vertical_spacing
+            if left is not None and right is not None:
+                inner_right, right_shift = right_contours[left]
+                inner_left, left_shift = left_contours[right]
+                gap = self.NODE_SPACING
+                for k in range(1, min(len(inner_right), len(inner_left)) + 1):
+                    needed = (inner_right[-k] + right_shift) - (inner_left[-k] + left_shift) + self.NODE_SPACING
+                    gap = max(gap, needed)
+                offsets[left] = -gap / 2
+                offsets[right] = gap / 2
+            elif left is not None:
+                offsets[left] = -self.NODE_SPACING / 2
+            else:
+                offsets[right] = self.NODE_SPACING / 2
             
-            self.positions[i] = (x, y)
+            left_contours[i] = self._merge_contours(left_contours, left, right, offsets)
+            right_contours[i] = self._merge_contours(right_contours, right, left, offsets)
+        
+        return offsets
+    
+    # Contour of a parent: the outer child's contour on top, continued by the
+    # inner child's contour where it is deeper. Only the shorter one is copied.
+    def _merge_contours(self, contours, outer, inner, offsets):
+        if outer is None:
+            outer, inner = inner, None
+        
+        levels, shift = contours[outer]
+        shift += offsets[outer]
+        contours[outer] = None
+        
+        if inner is not None:
+            deep_levels, deep_shift = contours[inner]
+            deep_shift += offsets[inner]
+            if len(deep_levels) > len(levels):
+                for k in range(1, len(levels) + 1):
+                    deep_levels[-k] = levels[-k] + shift - deep_shift
+                levels, shift = deep_levels, deep_shift
+        
+        levels.append(-shift)  # The parent itself, at x = 0
+        return levels, shift
     
     def paintEvent(self, event):
         painter = QPainter(self)
@@ -53,43 +124,40 @@ class BinaryTreeCanvas(QWidget):
         # Draw background
         painter.fillRect(self.rect(), QColor("#f8f9fa"))
         
-        if not self.tree_nodes or all(node is None for node in self.tree_nodes):
+        if not self.tree_nodes:
             painter.setPen(QPen(QColor("#7f8c8d"), 2))
             painter.setFont(QFont("Arial", 14))
             painter.drawText(self.rect(), Qt.AlignmentFlag.AlignCenter, "Tree is empty\nAdd nodes to visualize")
             return
         
         node_radius = 20
+        # Only draw what is inside the visible part of the scroll area
+        visible = event.rect().adjusted(-node_radius, -node_radius, node_radius, node_radius)
         
         # Draw edges first
-        for i, node_value in enumerate(self.tree_nodes):
-            if node_value is None or i not in self.positions:
+        for i, (_, parent, _, order) in enumerate(self.tree_nodes):
+            if parent is None:
                 continue
             
-            x, y = self.positions[i]
-            
-            # Draw edge to left child
-            left_child_idx = 2 * i + 1
-            if left_child_idx < len(self.tree_nodes) and self.tree_nodes[left_child_idx] is not None:
-                if left_child_idx in self.positions:
-                    left_x, left_y = self.positions[left_child_idx]
-                    painter.setPen(QPen(QColor("#3498db"), 2))
-                    painter.drawLine(x, y + node_radius, left_x, left_y - node_radius)
+            x, y = self.positions[parent]
+            child_x, child_y = self.positions[i]
+            if max(y, child_y) < visible.top() or min(y, child_y) > visible.bottom():
+                continue
+            if max(x, child_x) < visible.left() or min(x, child_x) > visible.right():
+                continue
             
-            # Draw edge to right child
-            right_child_idx = 2 * i + 2
-            if right_child_idx < len(self.tree_nodes) and self.tree_nodes[right_child_idx] is not None:
-                if right_child_idx in self.positions:
-                    right_x, right_y = self.positions[right_child_idx]
-                    painter.setPen(QPen(QColor("#e74c3c"), 2))
-                    painter.drawLine(x, y + node_radius, right_x, right_y - node_radius)
+            # Blue for left children, red for right children
+            if order < self.tree_nodes[parent][3]:
+                painter.setPen(QPen(QColor("#3498db"), 2))
+            else:
+                painter.setPen(QPen(QColor("#e74c3c"), 2))
+            painter.drawLine(x, y + node_radius, child_x, child_y - node_radius)
         
         # Draw nodes
-        for i, node_value in enumerate(self.tree_nodes):
-            if node_value is None or i not in self.positions:
-                continue
-            
+        for i, (node_value, _, _, _) in enumerate(self.tree_nodes):
             x, y = self.positions[i]
+            if not visible.contains(x, y):
+                continue
             
             # Determine node color (root is different)
             if i == 0:
@@ -111,17 +179,27 @@ class BinaryTreeCanvas(QWidget):
             
             painter.drawText(x - node_radius, y - node_radius, node_radius * 2, node_radius * 2, 
                            Qt.AlignmentFlag.AlignCenter, display_value)
-    
-    def _calculate_level(self, index):
-        if index < 0:
-            return 0
-        return int(math.log2(index + 1))
 
 
 class BinaryTreePage(QWidget):
+    # Max number of values shown for a traversal
+    TRAVERSAL_LIMIT = 200
+    # Values shown per page of a range query
+    RANGE_PAGE_SIZE = 50
+    # Tree backends the page can switch between
+    TREE_TYPES = {
+        "Normal": Tree,
+        "Balanceado (AVL)": AVLTree,
+        "Compacto (24 B/nodo)": CompactTree,
+    }
+
     def __init__(self):
         super().__init__()
-        self.tree = Tree()
+        self.store = PersistentStore("arbol", Tree)
+        self.tree = self.store.structure
+        self.tree_class = type(self.tree)
+        self.range_values = None
+        self.range_shown = 0
         
         layout = QVBoxLayout()
         
@@ -156,11 +234,23 @@ class BinaryTreePage(QWidget):
         search_btn.setStyleSheet("background-color: #f39c12; color: white; padding: 10px;")
         input_layout.addWidget(search_btn)
         
+        load_btn = QPushButton("Cargar archivo")
+        load_btn.clicked.connect(self.load_file)
+        load_btn.setStyleSheet("background-color: #2980b9; color: white; padding: 10px;")
+        input_layout.addWidget(load_btn)
+        
         clear_btn = QPushButton("Limpiar Árbol")
         clear_btn.clicked.connect(self.clear_tree)
         clear_btn.setStyleSheet("background-color: #95a5a6; color: white; padding: 10px;")
         input_layout.addWidget(clear_btn)
         
+        input_layout.addWidget(QLabel("Tipo:"))
+        self.tree_type = QComboBox()
+        self.tree_type.addItems(self.TREE_TYPES.keys())
+        self.tree_type.setCurrentText(self._typeName(self.tree_class))
+        self.tree_type.currentTextChanged.connect(self.change_tree_type)
+        input_layout.addWidget(self.tree_type)
+        
         input_layout.addStretch()
         layout.addLayout(input_layout)
         
@@ -186,9 +276,53 @@ class BinaryTreePage(QWidget):
         postorder_btn.setStyleSheet("background-color: #e67e22; color: white; padding: 8px;")
         traversal_layout.addWidget(postorder_btn)
         
+        traversal_layout.addSpacing(20)
+        
+        rank_btn = QPushButton("Contar menores")
+        rank_btn.clicked.connect(self.count_below)
+        rank_btn.setStyleSheet("background-color: #1abc9c; color: white; padding: 8px;")
+        traversal_layout.addWidget(rank_btn)
+        
+        median_btn = QPushButton("Mediana")
+        median_btn.clicked.connect(self.show_median)
+        median_btn.setStyleSheet("background-color: #34495e; color: white; padding: 8px;")
+        traversal_layout.addWidget(median_btn)
+        
         traversal_layout.addStretch()
         layout.addLayout(traversal_layout)
         
+        # Range query
+        range_layout = QHBoxLayout()
+        
+        range_label = QLabel("Rango:")
+        range_label.setStyleSheet("font-weight: bold;")
+        range_layout.addWidget(range_label)
+        
+        self.range_lo_input = QLineEdit()
+        self.range_lo_input.setPlaceholderText("Desde")
+        self.range_lo_input.setValidator(QIntValidator())
+        self.range_lo_input.setMaximumWidth(100)
+        range_layout.addWidget(self.range_lo_input)
+        
+        self.range_hi_input = QLineEdit()
+        self.range_hi_input.setPlaceholderText("Hasta")
+        self.range_hi_input.setValidator(QIntValidator())
+        self.range_hi_input.setMaximumWidth(100)
+        range_layout.addWidget(self.range_hi_input)
+        
+        range_btn = QPushButton("Valores en rango")
+        range_btn.clicked.connect(self.show_range)
+        range_btn.setStyleSheet("background-color: #8e44ad; color: white; padding: 8px;")
+        range_layout.addWidget(range_btn)
+        
+        next_page_btn = QPushButton("Siguiente página")
+        next_page_btn.clicked.connect(self.show_range_page)
+        next_page_btn.setStyleSheet("background-color: #7f8c8d; color: white; padding: 8px;")
+        range_layout.addWidget(next_page_btn)
+        
+        range_layout.addStretch()
+        layout.addLayout(range_layout)
+        
         # Visualization area with scroll
         scroll = QScrollArea()
         scroll.setWidgetResizable(True)
@@ -215,7 +349,7 @@ class BinaryTreePage(QWidget):
         
         try:
             int_value = int(value)
-            self.tree.insert(int_value)
+            self.store.apply("insert", int_value)
             self.tree_input.clear()
             self.update_display()
         except ValueError:
@@ -237,8 +371,7 @@ class BinaryTreePage(QWidget):
                 QMessageBox.warning(self, "No encontrado", f"Valor {int_value} no encontrado en el Árbol")
                 return
             
-            self
-            self.tree.root = self.tree.delNode(self.tree.root, int_value)
+            self.store.apply("delete", int_value)
             self.tree_input.clear()
             QMessageBox.information(self, "Eliminado", f"valor {int_value} eliminado exitosamente")
             self.update_display()
@@ -247,6 +380,32 @@ class BinaryTreePage(QWidget):
         except Exception as e:
             QMessageBox.warning(self, "Error", f"No se pudo eliminar el valor: {str(e)}")
     
+    def load_file(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Cargar valores", "", "Texto (*.txt *.csv);;Todos (*)")
+        if not path:
+            return
+        
+        try:
+            with open(path, encoding="utf-8") as file:
+                values = [int(token) for line in file for token in line.replace(",", " ").split()]
+        except ValueError:
+            QMessageBox.warning(self, "Valor inválido", "El archivo solo debe contener números enteros")
+            return
+        except OSError as e:
+            QMessageBox.warning(self, "Error", f"No se pudo leer el archivo: {str(e)}")
+            return
+        
+        # One merge + rebuild and a single refresh for the whole batch
+        try:
+            self.tree.bulk_insert(values)
+        except OverflowError:
+            QMessageBox.warning(self, "Valor fuera de rango", 
+                              "El modo compacto solo admite enteros de 64 bits")
+            return
+        self.store.snapshot()
+        self.update_display()
+        QMessageBox.information(self, "Cargado", f"{len(values)} valores añadidos al Árbol")
+    
     def search_node(self):
         value = self.tree_input.text().strip()
         if not value:
@@ -265,60 +424,129 @@ class BinaryTreePage(QWidget):
             QMessageBox.warning(self, "Valor inválido", "Ingrese número entero")
     
     def clear_tree(self):
-        self.tree = Tree()
+        self.tree = self.store.reset(self.tree_class())
         self.update_display()
         QMessageBox.information(self, "Podado", "Árbol podado")
     
+    def _typeName(self, tree_class):
+        for name, cls in self.TREE_TYPES.items():
+            if cls is tree_class:
+                return name
+        return "Normal"
+    
+    def change_tree_type(self, name):
+        # Rebuild the current values into the selected tree type
+        tree_class = self.TREE_TYPES[name]
+        tree = tree_class()
+        try:
+            for value in self.tree.iter_preorder():
+                tree.insert(value)
+        except OverflowError:
+            QMessageBox.warning(self, "Valor fuera de rango", 
+                              "El modo compacto solo admite enteros de 64 bits")
+            self.tree_type.blockSignals(True)
+            self.tree_type.setCurrentText(self._typeName(self.tree_class))
+            self.tree_type.blockSignals(False)
+            return
+        
+        self.tree_class = tree_class
+        self.tree = self.store.reset(tree)
+        self.update_display()
+    
     def show_traversal(self, order):
         if self.tree.root is None:
             QMessageBox.information(self, "Árbol vacío", "El Árbol se encuentra vacío")
             return
         
-        result = []
-        
         if order == "in-orden":
-            self._inorder_collect(self.tree.root, result)
+            values = self.tree.iter_inorder()
             description = "Izquierda → Raíz → Derecho"
         elif order == "pre-orden":
-            self._preorder_collect(self.tree.root, result)
+            values = self.tree.iter_preorder()
             description = "Raíz → Izquierda → Derecho"
         elif order == "post-orden":
-            self._postorder_collect(self.tree.root, result)
+            values = self.tree.iter_postorder()
             description = "Izquierda → Derecho → Raíz"
         
-        result_str = " → ".join(map(str, result))
+        # Only pull the first values from the generator, not the whole tree
+        result = list(islice(values, self.TRAVERSAL_LIMIT + 1))
+        result_str = " → ".join(map(str, result[:self.TRAVERSAL_LIMIT]))
+        if len(result) > self.TRAVERSAL_LIMIT:
+            result_str += " → ..."
         QMessageBox.information(self, f"{order.title()} Traversal", 
                               f"Orden: {description}\n\nResultado:\n{result_str}")
     
-    def _inorder_collect(self, node, result):
-        if node is None:
+    def show_range(self):
+        lo_str = self.range_lo_input.text().strip()
+        hi_str = self.range_hi_input.text().strip()
+        if not lo_str or not hi_str:
+            QMessageBox.warning(self, "Rango vacío", "Ingrese ambos extremos del rango")
+            return
+        
+        try:
+            lo = int(lo_str)
+            hi = int(hi_str)
+        except ValueError:
+            QMessageBox.warning(self, "Valor inválido", "Ambos extremos deben ser enteros")
+            return
+        
+        if lo > hi:
+            QMessageBox.warning(self, "Rango inválido", "El inicio del rango debe ser menor o igual al final")
             return
-        self._inorder_collect(node.left, result)
-        result.append(node.data)
-        self._inorder_collect(node.right, result)
+        
+        self.range_values = self.tree.range(lo, hi)
+        self.range_shown = 0
+        self.show_range_page()
     
-    def _preorder_collect(self, node, result):
-        if node is None:
+    def show_range_page(self):
+        if self.range_values is None:
+            QMessageBox.information(self, "Sin consulta", "Primero consulte los valores en un rango")
+            return
+        
+        # Pull only one page from the generator
+        page = list(islice(self.range_values, self.RANGE_PAGE_SIZE))
+        if not page:
+            self.range_values = None
+            QMessageBox.information(self, "Fin del rango", "No hay más valores en el rango")
+            return
+        
+        start = self.range_shown + 1
+        self.range_shown += len(page)
+        QMessageBox.information(self, "Valores en rango", 
+                              f"Valores {start} a {self.range_shown}:\n\n" + ", ".join(map(str, page)))
+    
+    def count_below(self):
+        value = self.tree_input.text().strip()
+        if not value:
+            QMessageBox.warning(self, "Valor vacío", "Ingrese número entero a comparar")
+            return
+        
+        try:
+            int_value = int(value)
+        except ValueError:
+            QMessageBox.warning(self, "Valor inválido", "Ingrese número entero")
             return
-        result.append(node.data)
-        self._preorder_collect(node.left, result)
-        self._preorder_collect(node.right, result)
+        
+        count = self.tree.rank(int_value)
+        QMessageBox.information(self, "Menores", f"Hay {count} valores menores que {int_value}")
     
-    def _postorder_collect(self, node, result):
-        if node is None:
+    def show_median(self):
+        if self.tree.root is None:
+            QMessageBox.information(self, "Árbol vacío", "El Árbol se encuentra vacío")
             return
-        self._postorder_collect(node.left, result)
-        self._postorder_collect(node.right, result)
-        result.append(node.data)
+        QMessageBox.information(self, "Mediana", f"Mediana de los valores: {self.tree.median()}")
     
     def update_display(self):
-        nodes = self.tree.levelOrder(self.tree.root)
+        # A pending range query is not valid after the tree changes
+        self.range_values = None
+        
+        nodes = self.tree.layout()
         self.tree_canvas.set_tree_data(nodes)
         
-        actual_node_count = sum(1 for node in nodes if node is not None)
+        node_count = self.tree.size()
         
-        if actual_node_count == 0:
+        if node_count == 0:
             self.tree_info.setText("Árbol vacío | Añada valores para iniciar")
         else:
             height = self.tree.getHeight(self.tree.root, 0)
-            self.tree_info.setText(f"Nodos: {actual_node_count} | Altura: {height}")
\ No newline at end of file
+            self.tree_info.setText(f"Nodos: {node_count} | Altura: {height}")
\ No newline at end of file
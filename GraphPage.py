@@ -1,10 +1,17 @@
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, 
                             QHBoxLayout, QPushButton, QLabel,
                             QLineEdit, QMessageBox, QScrollArea,
-                            QSplitter, QFrame)
+                            QSplitter, QFrame, QComboBox, QFileDialog)
 from PyQt6.QtGui import QFont, QPainter, QPen, QBrush, QColor, QIntValidator
 from PyQt6.QtCore import Qt, QPoint
+import csv
 import math
+import time
+
+from estructuras import Graph, MinimumSpanningForest, np
+from grafos import (MST_ENGINES, minimum_spanning_tree, ShortestPathCache,
+                    all_pairs_distances, save_distance_matrix, import_edge_list)
+from persistencia import PersistentStore
 
 
 class GraphCanvas(QWidget):
@@ -14,11 +21,13 @@ class GraphCanvas(QWidget):
         self.vertices = {}
         self.edges = []
         self.mst_edges = []
+        self.route_edges = set()
         self.title = title
         self.is_mst_view = False
         
-    def set_graph_data(self, adjacency_list, mst_edges=None, is_mst_view=False):
-        vertices_list = list(adjacency_list.keys())
+    # route is a list of vertices, its edges are drawn highlighted
+    def set_graph_data(self, graph, mst_edges=None, is_mst_view=False, route=None):
+        vertices_list = graph.vertices()
         n = len(vertices_list)
         
         self.is_mst_view = is_mst_view
@@ -30,7 +39,12 @@ class GraphCanvas(QWidget):
             self.update()
             return
         
-        self.mst_edges = mst_edges if mst_edges else []
+        # Set, so the per-edge MST checks while painting are O(1)
+        self.mst_edges = set(mst_edges) if mst_edges else set()
+        self.route_edges = set()
+        for from_vertex, to_vertex in zip(route or [], (route or [])[1:]):
+            self.route_edges.add((from_vertex, to_vertex))
+            self.route_edges.add((to_vertex, from_vertex))
         
         center_x = self.width() // 2
         center_y = (self.height() - 30) // 2 + 30
@@ -42,10 +56,11 @@ class GraphCanvas(QWidget):
             y = center_y + radius * math.sin(angle)
             self.vertices[vertex] = (int(x), int(y))
         
+        # Both directions, so every route gets an arrow head at each island
         self.edges = []
-        for from_vertex, neighbors in adjacency_list.items():
-            for to_vertex, weight in neighbors:
-                self.edges.append((from_vertex, to_vertex, weight))
+        for from_vertex, to_vertex, weight in graph.edges():
+            self.edges.append((from_vertex, to_vertex, weight))
+            self.edges.append((to_vertex, from_vertex, weight))
         
         self.update()
     
@@ -87,8 +102,12 @@ class GraphCanvas(QWidget):
                 is_mst_edge = (from_vertex, to_vertex, weight) in self.mst_edges or \
                              (to_vertex, from_vertex, weight) in self.mst_edges
                 
-                # Use different color for MST edges
-                if is_mst_edge or self.is_mst_view:
+                is_route_edge = (from_vertex, to_vertex) in self.route_edges
+                
+                # Use different color for route and MST edges
+                if is_route_edge:
+                    painter.setPen(QPen(QColor("#2980b9"), 4))
+                elif is_mst_edge or self.is_mst_view:
                     painter.setPen(QPen(QColor("#27ae60"), 3))
                 else:
                     painter.setPen(QPen(QColor("#7f8c8d"), 2))
@@ -108,7 +127,9 @@ class GraphCanvas(QWidget):
                 arrow_p2_x = end_x - arrow_size * math.cos(angle + math.pi / 6)
                 arrow_p2_y = end_y - arrow_size * math.sin(angle + math.pi / 6)
                 
-                if is_mst_edge or self.is_mst_view:
+                if is_route_edge:
+                    painter.setBrush(QBrush(QColor("#2980b9")))
+                elif is_mst_edge or self.is_mst_view:
                     painter.setBrush(QBrush(QColor("#27ae60")))
                 else:
                     painter.setBrush(QBrush(QColor("#7f8c8d")))
@@ -128,7 +149,10 @@ class GraphCanvas(QWidget):
                 painter.setPen(QPen(QColor("#7f8c8d"), 1))
                 painter.drawEllipse(mid_x - 12, mid_y - 12, 24, 24)
                 
-                if is_mst_edge or self.is_mst_view:
+                if is_route_edge:
+                    painter.setPen(QPen(QColor("#2980b9")))
+                    painter.setFont(QFont("Arial", 9, QFont.Weight.Bold))
+                elif is_mst_edge or self.is_mst_view:
                     painter.setPen(QPen(QColor("#27ae60")))
                     painter.setFont(QFont("Arial", 9, QFont.Weight.Bold))
                 else:
@@ -155,40 +179,19 @@ class GraphCanvas(QWidget):
                            Qt.AlignmentFlag.AlignCenter, display_label)
 
 
-class UnionFind:
-    def __init__(self, vertices):
-        self.parent = {v: v for v in vertices}
-        self.rank = {v: 0 for v in vertices}
-    
-    def find(self, vertex):
-        if self.parent[vertex] != vertex:
-            self.parent[vertex] = self.find(self.parent[vertex])
-        return self.parent[vertex]
-    
-    def union(self, v1, v2):
-        root1 = self.find(v1)
-        root2 = self.find(v2)
-        
-        if root1 == root2:
-            return False
-        
-        if self.rank[root1] < self.rank[root2]:
-            self.parent[root1] = root2
-        elif self.rank[root1] > self.rank[root2]:
-            self.parent[root2] = root1
-        else:
-            self.parent[root2] = root1
-            self.rank[root1] += 1
-        
-        return True
-
-
 class GraphPage(QWidget):
     def __init__(self):
         super().__init__()
-        self.graph = {}
+        self.store = PersistentStore("grafo", Graph)
+        self.graph = self.store.structure
+        # Kept up to date on every edit, the MST view is live unless cleared
+        self.mst = MinimumSpanningForest(self.graph)
+        self.mst_live = True
         self.mst_edges = []
         self.total_mst_weight = 0
+        # Shortest routes, cached per source until the map changes
+        self.routes = ShortestPathCache(self.graph)
+        self.route = []
         
         layout = QVBoxLayout()
         
@@ -240,22 +243,59 @@ class GraphPage(QWidget):
         add_edge_btn.setStyleSheet("background-color: #3498db; color: white; padding: 8px;")
         input_layout.addWidget(add_edge_btn)
         
+        import_btn = QPushButton("Importar rutas")
+        import_btn.clicked.connect(self.import_routes)
+        import_btn.setStyleSheet("background-color: #8e44ad; color: white; padding: 8px;")
+        input_layout.addWidget(import_btn)
+        
         input_layout.addStretch()
         layout.addLayout(input_layout)
         
+        # Shortest route between two islands
+        route_layout = QHBoxLayout()
+        self.route_from = QLineEdit()
+        self.route_from.setPlaceholderText("Ruta desde")
+        self.route_from.setMaximumWidth(100)
+        route_layout.addWidget(self.route_from)
+        
+        self.route_to = QLineEdit()
+        self.route_to.setPlaceholderText("Ruta hacia")
+        self.route_to.setMaximumWidth(100)
+        route_layout.addWidget(self.route_to)
+        
+        route_btn = QPushButton("Ruta más corta")
+        route_btn.clicked.connect(self.find_route)
+        route_btn.setStyleSheet("background-color: #2980b9; color: white; padding: 8px;")
+        route_layout.addWidget(route_btn)
+        
+        route_layout.addStretch()
+        layout.addLayout(route_layout)
+        
         # Algorithm buttons
         algo_layout = QHBoxLayout()
         
-        kruskal_btn = QPushButton("▶ Correr algoritmo de minimización (kruskal)")
-        kruskal_btn.clicked.connect(self.run_kruskal)
+        kruskal_btn = QPushButton("▶ Correr algoritmo de minimización")
+        kruskal_btn.clicked.connect(self.run_mst)
         kruskal_btn.setStyleSheet("background-color: #9b59b6; color: white; padding: 10px; font-weight: bold;")
         algo_layout.addWidget(kruskal_btn)
         
+        # auto: Prim on dense maps, Borůvka on large sparse ones (with NumPy), Kruskal otherwise
+        self.mst_engine = QComboBox()
+        self.mst_engine.addItems(["auto", *MST_ENGINES.keys()])
+        algo_layout.addWidget(self.mst_engine)
+        
         clear_mst_btn = QPushButton("Limpiar primer mapa")
         clear_mst_btn.clicked.connect(self.clear_mst)
         clear_mst_btn.setStyleSheet("background-color: #f39c12; color: white; padding: 10px;")
         algo_layout.addWidget(clear_mst_btn)
         
+        # Island-to-island distance matrix, needs NumPy
+        distances_btn = QPushButton("Exportar tabla de distancias")
+        distances_btn.clicked.connect(self.export_distances)
+        distances_btn.setStyleSheet("background-color: #1abc9c; color: white; padding: 10px;")
+        distances_btn.setEnabled(np is not None)
+        algo_layout.addWidget(distances_btn)
+        
         clear_btn = QPushButton("Limpiar ambos mapas")
         clear_btn.clicked.connect(self.clear_graph)
         clear_btn.setStyleSheet("background-color: #e74c3c; color: white; padding: 10px;")
@@ -315,9 +355,9 @@ class GraphPage(QWidget):
             QMessageBox.warning(self, "Duplicado", "Nombre de isla duplicado")
             return
         
-        self.graph[vertex] = []
+        self.store.apply("add_vertex", vertex)
+        self.mst.add_vertex(vertex)
         self.vertex_input.clear()
-        self.clear_mst()
         self.update_display()
     
     def add_edge(self):
@@ -342,61 +382,69 @@ class GraphPage(QWidget):
             QMessageBox.warning(self, "Nombres de Isla invalidos", "Ambos Nombres de Isla deben existir")
             return
         
-        if any(neighbor == to_v for neighbor, _ in self.graph[from_v]):
+        if self.graph.has_edge(from_v, to_v):
             QMessageBox.warning(self, "Distancia entre Islas duplicados", "Esta ruta ya existe")
             return
         
-        self.graph[from_v].append((to_v, weight))
-        self.graph[to_v].append((from_v, weight))
+        self.store.apply("add_edge", from_v, to_v, weight)
+        self.mst.add_edge(from_v, to_v, weight)
         
         self.from_vertex.clear()
         self.to_vertex.clear()
         self.weight_input.clear()
-        self.clear_mst()
         self.update_display()
     
-    def run_kruskal(self):
+    def import_routes(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Importar rutas", "",
+                                              "Rutas (*.csv *.tsv *.txt);;Todos (*)")
+        if not path:
+            return
+        
+        try:
+            stats = import_edge_list(self.graph, path)
+        except (OSError, UnicodeDecodeError, csv.Error, ValueError) as e:
+            QMessageBox.warning(self, "Error", 
+                              f"No se pudo leer el archivo completo: {str(e)}\n"
+                              f"Se conservan las rutas leídas antes del error.")
+            return
+        finally:
+            # One snapshot, one MST rebuild and a single refresh for the whole
+            # file. Rows read before an error are already in the graph, so this
+            # runs either way to keep the graph, the MST and the disk in step.
+            self.store.snapshot()
+            self.mst = MinimumSpanningForest(self.graph)
+            self.update_display()
+        
+        message = (f"Islas nuevas: {stats.vertices}\n"
+                   f"Rutas nuevas: {stats.edges}\n"
+                   f"Rutas duplicadas: {stats.duplicates}\n"
+                   f"Filas inválidas: {stats.invalid}")
+        if stats.invalid_lines:
+            message += f"\n(líneas {', '.join(map(str, stats.invalid_lines))}" \
+                       f"{'...' if stats.invalid > len(stats.invalid_lines) else ''})"
+        QMessageBox.information(self, "Rutas importadas", message)
+    
+    def run_mst(self):
         if len(self.graph) < 2:
             QMessageBox.warning(self, "Sin rutas suficientes", 
                               "Se necesitan al menos dos rutas para el algoritmo.")
             return
         
-        all_edges = []
-        seen_edges = set()
-        
-        for from_v, neighbors in self.graph.items():
-            for to_v, weight in neighbors:
-                edge_key = tuple(sorted([from_v, to_v]))
-                if edge_key not in seen_edges:
-                    seen_edges.add(edge_key)
-                    all_edges.append((from_v, to_v, weight))
-        
-        if not all_edges:
+        if self.graph.edge_count() == 0:
             QMessageBox.warning(self, "Sin distancias/rutas", "Mapa sin distancias.")
             return
         
-        all_edges.sort(key=lambda x: x[2])
-        
-        # Run Kruskal's
-        uf = UnionFind(self.graph.keys())
-        self.mst_edges = []
-        self.total_mst_weight = 0
-        
-        for from_v, to_v, weight in all_edges:
-            if uf.union(from_v, to_v):
-                self.mst_edges.append((from_v, to_v, weight))
-                self.total_mst_weight += weight
-                
-                if len(self.mst_edges) == len(self.graph) - 1:
-                    break
-        
+        # Rebuild from scratch and show the MST live again
+        engine, edges, _ = minimum_spanning_tree(self.graph, self.mst_engine.currentText())
+        self.mst = MinimumSpanningForest(self.graph, edges)
+        self.mst_live = True
         self.update_display()
         
         # Show result
         if len(self.mst_edges) == len(self.graph) - 1:
             edges_str = "\n".join([f"  {u} ─── {v}  (weight: {w})" 
                                   for u, v, w in self.mst_edges])
-            QMessageBox.information(self, "Kruskal's MST Result", 
+            QMessageBox.information(self, f"MST Result ({engine})", 
                                   f"✓ Minimum Spanning Tree found!\n\n"
                                   f"MST Edges:\n{edges_str}\n\n"
                                   f"Total Weight: {self.total_mst_weight}")
@@ -406,26 +454,80 @@ class GraphPage(QWidget):
                               f"Found {len(self.mst_edges)} edges, need {len(self.graph) - 1} for MST.\n"
                               f"Make sure all vertices are connected.")
     
+    def find_route(self):
+        from_v = self.route_from.text().strip()
+        to_v = self.route_to.text().strip()
+        
+        if from_v not in self.graph or to_v not in self.graph:
+            QMessageBox.warning(self, "Nombres de Isla invalidos", "Ambos Nombres de Isla deben existir")
+            return
+        
+        distance, path = self.routes.route(from_v, to_v)
+        if path is None:
+            self.route = []
+            self.update_display()
+            QMessageBox.warning(self, "Sin ruta", f"No hay ruta entre {from_v} y {to_v}")
+            return
+        
+        self.route = path
+        self.update_display()
+        QMessageBox.information(self, "Ruta más corta", 
+                              f"Ruta: {' → '.join(map(str, path))}\n\n"
+                              f"Distancia total: {distance}")
+    
+    def export_distances(self):
+        if len(self.graph) < 2:
+            QMessageBox.warning(self, "Sin islas suficientes", "Se necesitan al menos dos islas.")
+            return
+        
+        path, _ = QFileDialog.getSaveFileName(self, "Exportar tabla de distancias", "distancias.npy", "NumPy (*.npy)")
+        if not path:
+            return
+        
+        start = time.perf_counter()
+        engine, vertices, matrix = all_pairs_distances(self.graph)
+        seconds = time.perf_counter() - start
+        try:
+            path, names_path = save_distance_matrix(path, vertices, matrix)
+        except OSError as e:
+            QMessageBox.warning(self, "Error", f"No se pudo guardar la tabla: {str(e)}")
+            return
+        
+        QMessageBox.information(self, "Tabla exportada", 
+                              f"Distancias entre {len(vertices)} islas calculadas con {engine} "
+                              f"en {seconds:.3f} s.\n\n"
+                              f"Tabla: {path}\nNombres de islas: {names_path}")
+    
     def clear_mst(self):
-        self.mst_edges = []
-        self.total_mst_weight = 0
+        self.mst_live = False
         self.update_display()
     
     def clear_graph(self):
-        self.graph = {}
-        self.mst_edges = []
-        self.total_mst_weight = 0
+        self.graph = self.store.reset(Graph())
+        self.mst = MinimumSpanningForest()
+        self.routes = ShortestPathCache(self.graph)
         self.update_display()
     
     def update_display(self):
-        # Update original graph canvas (shows all edges, MST highlighted)
-        self.original_canvas.set_graph_data(self.graph, self.mst_edges, is_mst_view=False)
+        if self.mst_live:
+            self.mst_edges = list(self.mst.edges())
+            self.total_mst_weight = self.mst.total_weight
+        else:
+            self.mst_edges = []
+            self.total_mst_weight = 0
+        
+        # A route drawn before the last edit may no longer be the shortest
+        if self.routes.version != self.graph.version:
+            self.route = []
+        
+        # Update original graph canvas (shows all edges, MST and route highlighted)
+        self.original_canvas.set_graph_data(self.graph, self.mst_edges, is_mst_view=False, route=self.route)
         
         # Update MST canvas (shows only MST edges)
         self.mst_canvas.set_graph_data(self.graph, self.mst_edges, is_mst_view=True)
         
-        vertices_count = len(self.graph)
-        edges_count = sum(len(neighbors) for neighbors in self.graph.values()) // 2  # Undirected
+        vertices_count = self.graph.vertex_count()
+        edges_count = self.graph.edge_count()
         
         info_text = f"Vertices: {vertices_count} | Edges: {edges_count}"
         if self.mst_edges:
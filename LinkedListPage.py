@@ -3,12 +3,14 @@ from PyQt6.QtWidgets import (QWidget, QVBoxLayout,
                             QTextEdit, QLineEdit, QMessageBox, QSpinBox)
 from PyQt6.QtGui import QFont, QIntValidator
 
-from Estructuras import CircularList
+from estructuras import IndexedCircularList
+from persistencia import PersistentStore
 
 class CircularLinkedListPage(QWidget):
     def __init__(self):
         super().__init__()
-        self.cll = CircularList()
+        self.store = PersistentStore("prestamos", IndexedCircularList)
+        self.cll = self.store.structure
         
         layout = QVBoxLayout()
         
@@ -66,7 +68,21 @@ class CircularLinkedListPage(QWidget):
         
         layout.addLayout(input_layout2)
         
-        # Third button row - Utilities
+        # Third input row - Search by title
+        search_layout = QHBoxLayout()
+        
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("Buscar libro por nombre")
+        search_layout.addWidget(self.search_input)
+        
+        search_btn = QPushButton("¿Está prestado?")
+        search_btn.clicked.connect(self.search_book)
+        search_btn.setStyleSheet("background-color: #f39c12; color: white; padding: 10px;")
+        search_layout.addWidget(search_btn)
+        
+        layout.addLayout(search_layout)
+        
+        # Fourth button row - Utilities
         button_layout = QHBoxLayout()
         
         traverse_btn = QPushButton("Lista completa")
@@ -103,7 +119,7 @@ class CircularLinkedListPage(QWidget):
             QMessageBox.warning(self, "Valor vacío", "Por favor ingrese un nombre de libro")
             return
         
-        self.cll.push(value)
+        self.store.apply("push", value)
         self.cll_input.clear()
         self.update_display()
         QMessageBox.information(self, "Añadido", f"Libro '{value}' añadido al final de la lista")
@@ -116,7 +132,7 @@ class CircularLinkedListPage(QWidget):
             QMessageBox.warning(self, "Valor vacío", "Por favor ingrese un nombre de libro")
             return
         
-        result = self.cll.insert_at(position, value)
+        result = self.store.apply("insert_at", position, value)
         
         if result == "Invalid position":
             QMessageBox.warning(self, "Posición inválida", 
@@ -129,7 +145,7 @@ class CircularLinkedListPage(QWidget):
                               f"Libro '{value}' insertado en posición {position}")
     
     def delete_node(self):
-        removed = self.cll.pop()
+        removed = self.store.apply("pop")
         if removed == "List is Empty!":
             QMessageBox.warning(self, "Lista Vacía", "La lista está vacía")
         else:
@@ -148,10 +164,7 @@ class CircularLinkedListPage(QWidget):
                               f"La posición debe estar entre 0 y {self.cll.get_size() - 1}")
             return
         
-        # Get the book name before deleting
-        book_name = self.cll.get_at(position)
-        
-        removed = self.cll.delete_at(position)
+        removed = self.store.apply("delete_at", position)
         
         if removed == "List is Empty!" or removed == "Invalid position":
             QMessageBox.warning(self, "Error", "No se pudo eliminar el libro")
@@ -160,6 +173,21 @@ class CircularLinkedListPage(QWidget):
             QMessageBox.information(self, "Eliminado", 
                                   f"Libro eliminado de posición {position}: {removed}")
     
+    def search_book(self):
+        value = self.search_input.text().strip()
+        if not value:
+            QMessageBox.warning(self, "Valor vacío", "Por favor ingrese un nombre de libro")
+            return
+        
+        if not self.cll.contains(value):
+            QMessageBox.information(self, "Disponible", f"El libro '{value}' no está prestado")
+            return
+        
+        positions = ", ".join(map(str, self.cll.positions_of(value)))
+        QMessageBox.information(self, "Prestado", 
+                              f"El libro '{value}' está prestado ({self.cll.count(value)} copia(s))\n"
+                              f"Posiciones: {positions}")
+    
     def traverse(self):
         if self.cll.is_empty():
             QMessageBox.information(self, "Lista Vacía", "No hay libros en la lista")
@@ -183,7 +211,7 @@ class CircularLinkedListPage(QWidget):
                                      QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
         
         if reply == QMessageBox.StandardButton.Yes:
-            self.cll = CircularList()
+            self.cll = self.store.reset(IndexedCircularList())
             self.update_display()
             QMessageBox.information(self, "Limpiado", "Lista ha sido limpiada")
     
@@ -1,14 +1,24 @@
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, 
                             QHBoxLayout, QPushButton, QLabel,
-                            QTextEdit, QLineEdit, QMessageBox)
+                            QTextEdit, QLineEdit, QMessageBox,
+                            QSpinBox, QComboBox)
 from PyQt6.QtGui import QFont
 
-from Estructuras import Queue
+from estructuras import Queue
+from persistencia import PersistentStore
 
 class QueuePage(QWidget):
+    # Max number of clients shown in the display
+    DISPLAY_LIMIT = 200
+    # What happens when a client arrives at a full queue
+    POLICIES = {"Rechazar al nuevo": Queue.REJECT,
+                "Sacar al más antiguo": Queue.OVERWRITE,
+                "Esperar turno": Queue.BLOCK}
+
     def __init__(self):
         super().__init__()
-        self.queue = Queue()
+        self.store = PersistentStore("cola", Queue)
+        self.queue = self.store.structure
         
         layout = QVBoxLayout()
         
@@ -45,6 +55,25 @@ class QueuePage(QWidget):
         
         layout.addLayout(input_layout)
         
+        # Capacity row, 0 leaves the queue without limit
+        limit_layout = QHBoxLayout()
+        self.capacity_input = QSpinBox()
+        self.capacity_input.setRange(0, 1_000_000)
+        self.capacity_input.setPrefix("Capacidad: ")
+        self.capacity_input.setSpecialValueText("Capacidad: sin límite")
+        limit_layout.addWidget(self.capacity_input)
+        
+        self.policy_input = QComboBox()
+        self.policy_input.addItems(self.POLICIES.keys())
+        limit_layout.addWidget(self.policy_input)
+        
+        limit_btn = QPushButton("Aplicar límite")
+        limit_btn.clicked.connect(self.change_limit)
+        limit_btn.setStyleSheet("background-color: #9b59b6; color: white; padding: 10px;")
+        limit_layout.addWidget(limit_btn)
+        
+        layout.addLayout(limit_layout)
+        
         self.queue_display = QTextEdit()
         self.queue_display.setReadOnly(True)
         self.queue_display.setMaximumHeight(150)
@@ -56,17 +85,26 @@ class QueuePage(QWidget):
         
         layout.addStretch()
         self.setLayout(layout)
+        self.show_limit()
         self.update_display()
     
     def enqueue(self):
         value = self.queue_input.text().strip()
         if value:
-            self.queue.enqueue(value)
+            # Nobody can dequeue while the GUI thread waits, so a blocking
+            # queue is asked not to wait at all
+            if self.store.apply("enqueue", value, 0) == "Queue is full":
+                if self.queue.policy == Queue.BLOCK:
+                    QMessageBox.warning(self, "Cola Llena",
+                                        "La cola está llena, atienda a un cliente para que pase el siguiente")
+                else:
+                    QMessageBox.warning(self, "Cola Llena", "La cola está llena")
+                return
             self.queue_input.clear()
             self.update_display()
     
     def dequeue(self):
-        return_value = self.queue.dequeue()
+        return_value = self.store.apply("dequeue")
         if return_value == "Queue is empty":
             QMessageBox.warning(self, "Cola Vacía", "La cola está Vacía")
         else:
@@ -80,7 +118,28 @@ class QueuePage(QWidget):
         else:
             QMessageBox.information(self, "Frente", f"Cliente en el frente: {return_value}")
     
+    # Rebuild the queue with the chosen capacity and policy, keeping its clients
+    def change_limit(self):
+        capacity = self.capacity_input.value() or None
+        if capacity is not None and capacity < self.queue.size():
+            QMessageBox.warning(self, "Capacidad",
+                                f"La cola ya tiene {self.queue.size()} clientes, más que la capacidad pedida")
+            self.show_limit()
+            return
+        queue = Queue(capacity, self.POLICIES[self.policy_input.currentText()])
+        queue.queue.extend(self.queue.queue)
+        self.queue = self.store.reset(queue)
+        self.update_display()
+    
+    # Show the capacity and policy of the current (possibly restored) queue
+    def show_limit(self):
+        self.capacity_input.setValue(self.queue.capacity or 0)
+        self.policy_input.setCurrentText(next(k for k, v in self.POLICIES.items() if v == self.queue.policy))
+    
     def update_display(self):
-        display = self.queue.toList()
+        display = self.queue.toList(self.DISPLAY_LIMIT)
         self.queue_display.setText(display)
-        self.queue_info.setText(f"Tamaño: {self.queue.size()}")
\ No newline at end of file
+        if self.queue.capacity is None:
+            self.queue_info.setText(f"Tamaño: {self.queue.size()}")
+        else:
+            self.queue_info.setText(f"Tamaño: {self.queue.size()} / {self.queue.capacity}")
\ No newline at end of file
@@ -3,12 +3,15 @@ from PyQt6.QtWidgets import (QWidget, QVBoxLayout,
                             QLabel, QTextEdit, QLineEdit, QMessageBox)
 from PyQt6.QtGui import QFont
 
-from Estructuras import Stack
+from estructuras import Stack
+from persistencia import PersistentStore
 
 class StackPage(QWidget):
     def __init__(self):
         super().__init__()
-        self.stack = Stack()
+        # Survives restarts through a journal + snapshot in datos/
+        self.store = PersistentStore("pila", Stack)
+        self.stack = self.store.structure
         
         layout = QVBoxLayout()
         
@@ -60,12 +63,12 @@ class StackPage(QWidget):
     def push_stack(self):
         value = self.stack_input.text().strip()
         if value:
-            self.stack.push(value)
+            self.store.apply("push", value)
             self.stack_input.clear()
             self.update_display()
     
     def pop_stack(self):
-        value = self.stack.pop()
+        value = self.store.apply("pop")
         if value == "Stack is empty":
             QMessageBox.warning(self, "Pila Vacía", "No hay libros en la pila.")
         else:
@@ -0,0 +1,308 @@
+import bisect
+import math
+import time
+
+from estructuras import IntArray, BlockList, MappedIntArray, np
+
+
+# Counters reported by every sort engine
+class SortStats:
+    def __init__(self, engine):
+        self.engine = engine
+        self.comparisons = 0
+        self.moves = 0
+        self.seconds = 0.0
+
+    def __repr__(self):
+        return (f"SortStats({self.engine}: {self.comparisons} comparisons, "
+                f"{self.moves} moves, {self.seconds:.6f} s)")
+
+
+# Gap sequences for Shell sort, largest gap first
+def halving_gaps(n):
+    gaps = []
+    gap = n // 2
+    while gap > 0:
+        gaps.append(gap)
+        gap //= 2
+    return gaps
+
+
+def ciura_gaps(n):
+    gaps = [1, 4, 10, 23, 57, 132, 301, 701, 1750]
+    # Extended past the known terms with the usual 2.25 ratio
+    while gaps[-1] < n:
+        gaps.append(int(gaps[-1] * 2.25))
+    return [gap for gap in reversed(gaps) if gap < n] or [1]
+
+
+def tokuda_gaps(n):
+    gaps = []
+    k = 0
+    while True:
+        gap = math.ceil((9 * (9 / 4) ** k - 4) / 5)
+        if gap >= n and gaps:
+            break
+        gaps.append(gap)
+        k += 1
+    return list(reversed(gaps))
+
+
+def shell_sort(array, gaps=None, stats=None):
+    stats = stats or SortStats("shell")
+    array_len = len(array)
+    comparisons = moves = 0
+
+    for gap in (gaps if gaps is not None else halving_gaps(array_len)):
+        for i in range(gap, array_len):
+            temp = array[i]
+            j = i
+            while j >= gap:
+                comparisons += 1
+                if array[j - gap] <= temp:
+                    break
+                array[j] = array[j - gap]
+                moves += 1
+                j -= gap
+            array[j] = temp
+            moves += 1
+
+    stats.comparisons += comparisons
+    stats.moves += moves
+    return stats
+
+
+def _insertion_sort(array, lo, hi, stats):
+    for i in range(lo + 1, hi + 1):
+        temp = array[i]
+        j = i
+        while j > lo:
+            stats.comparisons += 1
+            if array[j - 1] <= temp:
+                break
+            array[j] = array[j - 1]
+            stats.moves += 1
+            j -= 1
+        array[j] = temp
+        stats.moves += 1
+
+
+def _sift_down(array, lo, start, end, stats):
+    root = start
+    while 2 * (root - lo) + 1 + lo <= end:
+        child = 2 * (root - lo) + 1 + lo
+        if child + 1 <= end:
+            stats.comparisons += 1
+            if array[child] < array[child + 1]:
+                child += 1
+        stats.comparisons += 1
+        if array[root] >= array[child]:
+            return
+        array[root], array[child] = array[child], array[root]
+        stats.moves += 2
+        root = child
+
+
+def _heap_sort(array, lo, hi, stats):
+    for start in range((hi - lo - 1) // 2 + lo, lo - 1, -1):
+        _sift_down(array, lo, start, hi, stats)
+    for end in range(hi, lo, -1):
+        array[lo], array[end] = array[end], array[lo]
+        stats.moves += 2
+        _sift_down(array, lo, lo, end - 1, stats)
+
+
+def _partition(array, lo, hi, stats):
+    # Median of three as pivot, moved to hi
+    mid = (lo + hi) // 2
+    stats.comparisons += 3
+    if array[mid] < array[lo]:
+        array[mid], array[lo] = array[lo], array[mid]
+    if array[hi] < array[lo]:
+        array[hi], array[lo] = array[lo], array[hi]
+    if array[mid] < array[hi]:
+        array[mid], array[hi] = array[hi], array[mid]
+    stats.moves += 6
+
+    pivot = array[hi]
+    i = lo
+    for j in range(lo, hi):
+        stats.comparisons += 1
+        if array[j] < pivot:
+            array[i], array[j] = array[j], array[i]
+            stats.moves += 2
+            i += 1
+    array[i], array[hi] = array[hi], array[i]
+    stats.moves += 2
+    return i
+
+
+# Quicksort that switches to heap sort when recursion gets too deep and to
+# insertion sort on small ranges
+def intro_sort(array, stats=None):
+    stats = stats or SortStats("introsort")
+    if len(array) < 2:
+        return stats
+
+    pending = [(0, len(array) - 1, 2 * int(math.log2(len(array))))]
+    while pending:
+        lo, hi, depth = pending.pop()
+        if hi - lo < 16:
+            _insertion_sort(array, lo, hi, stats)
+        elif depth == 0:
+            _heap_sort(array, lo, hi, stats)
+        else:
+            p = _partition(array, lo, hi, stats)
+            pending.append((lo, p - 1, depth - 1))
+            pending.append((p + 1, hi, depth - 1))
+    return stats
+
+
+# LSD radix sort on bytes, integers only. Negative numbers are sorted by
+# offsetting everything by the minimum value.
+def radix_sort(array, stats=None):
+    stats = stats or SortStats("radix")
+    if len(array) < 2:
+        return stats
+
+    offset = min(array)
+    keys = [value - offset for value in array]
+    largest = max(keys)
+    values = list(array)
+    shift = 0
+
+    while (largest >> shift) > 0:
+        buckets = [[] for _ in range(256)]
+        for key, value in zip(keys, values):
+            buckets[(key >> shift) & 0xFF].append((key, value))
+        pairs = [pair for bucket in buckets for pair in bucket]
+        keys = [key for key, _ in pairs]
+        values = [value for _, value in pairs]
+        stats.moves += 2 * len(array)
+        shift += 8
+
+    array[:] = values
+    stats.moves += len(array)
+    return stats
+
+
+# Built-in Timsort, comparisons are counted through a key wrapper
+def tim_sort(array, stats=None):
+    stats = stats or SortStats("timsort")
+
+    class CountingKey:
+        __slots__ = ("value",)
+
+        def __init__(self, value):
+            self.value = value
+
+        def __lt__(self, other):
+            stats.comparisons += 1
+            return self.value < other.value
+
+    before = list(array)
+    array.sort(key=CountingKey)
+    stats.moves += sum(1 for old, new in zip(before, array) if old is not new)
+    return stats
+
+
+# NumPy's sort on int64 data, IntArray and MappedIntArray are sorted in place
+def numpy_sort(array, stats=None):
+    stats = stats or SortStats("numpy")
+    if isinstance(array, (IntArray, MappedIntArray)):
+        array.sort()
+    else:
+        array[:] = np.sort(np.asarray(array, dtype=np.int64)).tolist()
+    stats.moves += len(array)
+    return stats
+
+
+SORT_ENGINES = {
+    "shell": lambda array, stats: shell_sort(array, halving_gaps(len(array)), stats),
+    "ciura": lambda array, stats: shell_sort(array, ciura_gaps(len(array)), stats),
+    "tokuda": lambda array, stats: shell_sort(array, tokuda_gaps(len(array)), stats),
+    "introsort": intro_sort,
+    "radix": radix_sort,
+    "timsort": tim_sort,
+}
+if np is not None:
+    SORT_ENGINES["numpy"] = numpy_sort
+
+
+# Sort array in place with the chosen engine and return its SortStats
+def sort(array, engine="shell"):
+    if engine not in SORT_ENGINES:
+        raise ValueError(f"Unknown sort engine: {engine}")
+    stats = SortStats(engine)
+    start = time.perf_counter()
+    if isinstance(array, (IntArray, BlockList, MappedIntArray)) and engine != "numpy":
+        # Engines index heavily (and timsort needs list.sort), so sort a flat
+        # copy and write it back
+        values = array.tolist()
+        SORT_ENGINES[engine](values, stats)
+        array[:] = values
+    else:
+        SORT_ENGINES[engine](array, stats)
+    stats.seconds = time.perf_counter() - start
+    return stats
+
+
+# Index of value in a sorted array, -1 if not found
+def binary_search(array, value):
+    if isinstance(array, IntArray):
+        index = int(array.searchsorted(value))
+        return index if index < len(array) and array[index] == value else -1
+
+    left = 0
+    right = len(array) - 1
+
+    while left <= right:
+        mid = (left + right) // 2
+
+        if array[mid] == value:
+            return mid
+        elif array[mid] < value:
+            left = mid + 1
+        else:
+            right = mid - 1
+
+    return -1
+
+
+# Look up many values in a sorted array at once. Returns (value, index) pairs
+# in query order, index -1 when not found. The queries are handled in sorted
+# order so each search starts where the previous one ended.
+def search_many(array, values):
+    values = list(values)
+    if isinstance(array, IntArray):
+        found = array.values()
+        indices = array.searchsorted(values).tolist()
+        return [(value, index if index < len(array) and found[index] == value else -1)
+                for value, index in zip(values, indices)]
+
+    results = [None] * len(values)
+    lo = 0
+    for position in sorted(range(len(values)), key=values.__getitem__):
+        value = values[position]
+        lo = bisect.bisect_left(array, value, lo)
+        index = lo if lo < len(array) and array[lo] == value else -1
+        results[position] = (value, index)
+    return results
+
+
+# Insert value into a sorted array keeping it sorted, returns its index
+def sorted_insert(array, value):
+    if isinstance(array, IntArray):
+        index = int(array.searchsorted(value))
+    else:
+        index = bisect.bisect_left(array, value)
+    array.insert(index, value)
+    return index
+
+
+# Remove one occurrence of value from a sorted array, returns its index or -1
+def sorted_remove(array, value):
+    index = binary_search(array, value)
+    if index != -1:
+        array.pop(index)
+    return index
@@ -1,4 +1,17 @@
+from array import array
 from collections import deque
+from itertools import chain, islice
+import heapq
+import mmap
+import os
+import random
+import struct
+import threading
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, only IntArray needs it
+    np = None
 
 class Stack:
     def __init__(self):
@@ -32,16 +45,48 @@ class Stack:
 
 
 class Queue:
-    def __init__(self):
-        self.queue = []
+    # Policies for a full queue (only apply when capacity is set)
+    REJECT = "reject"
+    BLOCK = "block"
+    OVERWRITE = "overwrite"
+    # Seconds a blocking enqueue waits for room when no timeout is given
+    BLOCK_TIMEOUT = 5.0
+
+    def __init__(self, capacity=None, policy="reject"):
+        if capacity is not None and capacity <= 0:
+            raise ValueError("capacity must be positive")
+        if policy not in (self.REJECT, self.BLOCK, self.OVERWRITE):
+            raise ValueError(f"Unknown policy: {policy}")
+        self.capacity = capacity
+        self.policy = policy
+        # deque gives O(1) append/popleft instead of list.pop(0)
+        self.queue = deque()
+        self._not_full = threading.Condition()
+    
+    def isFull(self):
+        return self.capacity is not None and len(self.queue) >= self.capacity
     
-    def enqueue(self, element):
-        self.queue.append(element)
+    def enqueue(self, element, timeout=None):
+        with self._not_full:
+            if self.isFull():
+                if self.policy == self.REJECT:
+                    return "Queue is full"
+                if self.policy == self.OVERWRITE:
+                    self.queue.popleft()
+                else:
+                    if timeout is None:
+                        timeout = self.BLOCK_TIMEOUT
+                    if not self._not_full.wait_for(lambda: not self.isFull(), timeout):
+                        return "Queue is full"
+            self.queue.append(element)
     
     def dequeue(self):
-        if self.isEmpty():
-            return "Queue is empty"
-        return self.queue.pop(0)
+        with self._not_full:
+            if self.isEmpty():
+                return "Queue is empty"
+            element = self.queue.popleft()
+            self._not_full.notify()
+            return element
     
     def peek(self):
         if self.isEmpty():
@@ -54,20 +99,407 @@ class Queue:
     def size(self):
         return len(self.queue)
     
-    def toList(self):
-        queueList = ""
-        queueList += "Caja"
-        for i in range(self.size()):
-            queueList += f"<- #{i} Item: {self.queue[i]}|"
+    # limit shows only the first N items so huge queues don't stall the GUI
+    def toList(self, limit=None):
+        items = self.queue if limit is None else islice(self.queue, limit)
+        queueList = "Caja" + "".join(f"<- #{i} Item: {item}|" for i, item in enumerate(items))
+        if limit is not None and self.size() > limit:
+            queueList += f"<- ... ({self.size() - limit} más)"
         return queueList
 
 
+# Growable int64 array backed by NumPy, with a list-like API plus vectorized
+# bulk operations. Appends are amortized O(1) through capacity doubling.
+class IntArray:
+    def __init__(self, values=()):
+        if np is None:
+            raise ImportError("IntArray requires numpy")
+        values = self._asInt64(values)
+        self.data = np.empty(max(16, len(values)), dtype=np.int64)
+        self.data[:len(values)] = values
+        self.length = len(values)
+
+    def _asInt64(self, values):
+        if isinstance(values, IntArray):
+            return values.values()
+        if isinstance(values, np.ndarray):
+            return values.astype(np.int64, copy=False)
+        return np.fromiter(values, dtype=np.int64)
+
+    def _reserve(self, extra):
+        needed = self.length + extra
+        if needed > len(self.data):
+            data = np.empty(max(needed, 2 * len(self.data)), dtype=np.int64)
+            data[:self.length] = self.data[:self.length]
+            self.data = data
+
+    def _checkIndex(self, index):
+        if index < 0:
+            index += self.length
+        if index < 0 or index >= self.length:
+            raise IndexError("IntArray index out of range")
+        return index
+
+    # Live view of the used part of the buffer
+    def values(self):
+        return self.data[:self.length]
+
+    def append(self, value):
+        self._reserve(1)
+        self.data[self.length] = value
+        self.length += 1
+
+    def extend(self, values):
+        values = self._asInt64(values)
+        self._reserve(len(values))
+        self.data[self.length:self.length + len(values)] = values
+        self.length += len(values)
+
+    def insert(self, index, value):
+        self.insert_many(index, (value,))
+
+    # Insert a whole batch at index with a single shift of the tail
+    def insert_many(self, index, values):
+        values = self._asInt64(values)
+        # Negative indexes count from the end, like list.insert
+        if index < 0:
+            index += self.length
+        index = max(0, min(index, self.length))
+        count = len(values)
+        self._reserve(count)
+        self.data[index + count:self.length + count] = self.data[index:self.length]
+        self.data[index:index + count] = values
+        self.length += count
+
+    def pop(self, index=-1):
+        index = self._checkIndex(index)
+        value = int(self.data[index])
+        self.data[index:self.length - 1] = self.data[index + 1:self.length]
+        self.length -= 1
+        return value
+
+    def clear(self):
+        self.length = 0
+
+    def sort(self):
+        self.values().sort()
+
+    # Positions where each value would be inserted to keep a sorted array sorted
+    def searchsorted(self, values):
+        return np.searchsorted(self.values(), values)
+
+    def tolist(self):
+        return self.values().tolist()
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.values()[index]
+        return int(self.data[self._checkIndex(index)])
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            self.values()[index] = value
+        else:
+            self.data[self._checkIndex(index)] = value
+
+    def __iter__(self):
+        return iter(self.values().tolist())
+
+
+# List split into blocks of about BLOCK_SIZE values (sqrt decomposition).
+# Positional insert/delete only shift one block, and a Fenwick tree over the
+# block sizes finds the block holding an index in O(log n).
+class BlockList:
+    BLOCK_SIZE = 1024
+
+    def __init__(self, values=()):
+        self._rebuild(list(values))
+
+    def _rebuild(self, values):
+        size = self.BLOCK_SIZE
+        self.blocks = [values[i:i + size] for i in range(0, len(values), size)]
+        self.length = len(values)
+        self.sizes = None
+
+    # Fenwick tree of block sizes, rebuilt lazily when blocks are added or removed
+    def _sizes(self):
+        if self.sizes is None:
+            self.sizes = [0] * (len(self.blocks) + 1)
+            for i, block in enumerate(self.blocks, 1):
+                self.sizes[i] += len(block)
+                parent = i + (i & -i)
+                if parent <= len(self.blocks):
+                    self.sizes[parent] += self.sizes[i]
+        return self.sizes
+
+    def _resize(self, block, delta):
+        if self.sizes is None:
+            return
+        i = block + 1
+        while i < len(self.sizes):
+            self.sizes[i] += delta
+            i += i & -i
+
+    def _locate(self, index):
+        if index < 0:
+            index += self.length
+        if index < 0 or index >= self.length:
+            raise IndexError("BlockList index out of range")
+        sizes = self._sizes()
+        block = 0
+        step = 1 << (len(self.blocks).bit_length() - 1)
+        while step:
+            if block + step <= len(self.blocks) and sizes[block + step] <= index:
+                block += step
+                index -= sizes[block]
+            step >>= 1
+        return block, index
+
+    def append(self, value):
+        if not self.blocks or len(self.blocks[-1]) >= self.BLOCK_SIZE:
+            self.blocks.append([value])
+            self.sizes = None
+        else:
+            self.blocks[-1].append(value)
+            self._resize(len(self.blocks) - 1, 1)
+        self.length += 1
+
+    def extend(self, values):
+        for value in values:
+            self.append(value)
+
+    def insert(self, index, value):
+        if index < 0:
+            index = max(0, index + self.length)
+        if index >= self.length:
+            self.append(value)
+            return
+
+        block, position = self._locate(index)
+        self.blocks[block].insert(position, value)
+        self.length += 1
+        # Split blocks that grew too big so shifts stay short
+        if len(self.blocks[block]) > 2 * self.BLOCK_SIZE:
+            half = len(self.blocks[block]) // 2
+            self.blocks[block:block + 1] = [self.blocks[block][:half], self.blocks[block][half:]]
+            self.sizes = None
+        else:
+            self._resize(block, 1)
+
+    def pop(self, index=-1):
+        block, position = self._locate(index)
+        value = self.blocks[block].pop(position)
+        self.length -= 1
+        if not self.blocks[block]:
+            del self.blocks[block]
+            self.sizes = None
+        else:
+            self._resize(block, -1)
+        return value
+
+    def clear(self):
+        self._rebuild([])
+
+    def tolist(self):
+        return [value for block in self.blocks for value in block]
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.tolist()[index]
+        block, position = self._locate(index)
+        return self.blocks[block][position]
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            values = self.tolist()
+            values[index] = value
+            self._rebuild(values)
+        else:
+            block, position = self._locate(index)
+            self.blocks[block][position] = value
+
+    def __iter__(self):
+        return chain.from_iterable(self.blocks)
+
+
+# Persistent int64 array in a fixed-width binary file opened with mmap.
+# Opening reads only the header (no parsing, zero copy) and edits are made
+# in place in the mapped file. Layout: 16 byte header (magic, flags, length)
+# followed by the values, with spare capacity at the end of the file.
+class MappedIntArray:
+    HEADER = struct.Struct("<4sIQ")
+    MAGIC = b"CTAS"
+    SORTED_FLAG = 1
+    ITEM_SIZE = 8
+    MIN_CAPACITY = 1024
+
+    def __init__(self, path, values=()):
+        self.path = path
+        exists = os.path.exists(path) and os.path.getsize(path) >= self.HEADER.size
+        self.file = open(path, "r+b" if exists else "w+b")
+        if not exists:
+            self.file.write(self.HEADER.pack(self.MAGIC, 0, 0))
+            self.file.truncate(self.HEADER.size + self.MIN_CAPACITY * self.ITEM_SIZE)
+        self._map()
+
+        magic, flags, length = self.HEADER.unpack_from(self.map, 0)
+        if magic != self.MAGIC:
+            self._unmap()
+            self.file.close()
+            raise ValueError(f"{path} is not an account array file")
+        self.length = length
+        self.flags = flags
+        self.extend(values)
+
+    def _map(self):
+        self.map = mmap.mmap(self.file.fileno(), 0)
+        view = memoryview(self.map)
+        self.items = view[self.HEADER.size:].cast("q")
+        view.release()
+
+    def _unmap(self):
+        self.items.release()
+        self.map.close()
+
+    def _writeHeader(self):
+        self.HEADER.pack_into(self.map, 0, self.MAGIC, self.flags, self.length)
+
+    def _reserve(self, extra):
+        needed = self.length + extra
+        if needed > len(self.items):
+            capacity = max(needed, 2 * len(self.items))
+            self._unmap()
+            self.file.truncate(self.HEADER.size + capacity * self.ITEM_SIZE)
+            self._map()
+
+    def _checkIndex(self, index):
+        if index < 0:
+            index += self.length
+        if index < 0 or index >= self.length:
+            raise IndexError("MappedIntArray index out of range")
+        return index
+
+    # Same error as array("q") in extend; insert must fail before it moves the tail
+    def _checkValue(self, value):
+        if not -2 ** 63 <= value < 2 ** 63:
+            raise OverflowError("MappedIntArray values must fit in 64 bits")
+        return value
+
+    def _offset(self, index):
+        return self.HEADER.size + index * self.ITEM_SIZE
+
+    # Sorted flag stored in the header
+    @property
+    def sorted(self):
+        return bool(self.flags & self.SORTED_FLAG)
+
+    @sorted.setter
+    def sorted(self, value):
+        self.flags = self.flags | self.SORTED_FLAG if value else self.flags & ~self.SORTED_FLAG
+        self._writeHeader()
+
+    def append(self, value):
+        self._checkValue(value)
+        self._reserve(1)
+        self.items[self.length] = value
+        self.length += 1
+        self._writeHeader()
+
+    def extend(self, values):
+        values = array("q", values)
+        self._reserve(len(values))
+        self.items[self.length:self.length + len(values)] = values
+        self.length += len(values)
+        self._writeHeader()
+
+    def insert(self, index, value):
+        self._checkValue(value)
+        if index < 0:
+            index = max(0, index + self.length)
+        index = min(index, self.length)
+        self._reserve(1)
+        self.map.move(self._offset(index + 1), self._offset(index), (self.length - index) * self.ITEM_SIZE)
+        self.items[index] = value
+        self.length += 1
+        self._writeHeader()
+
+    def pop(self, index=-1):
+        index = self._checkIndex(index)
+        value = self.items[index]
+        self.map.move(self._offset(index), self._offset(index + 1), (self.length - index - 1) * self.ITEM_SIZE)
+        self.length -= 1
+        self._writeHeader()
+        return value
+
+    def clear(self):
+        self.length = 0
+        self._writeHeader()
+
+    # Sorted in place inside the file, with NumPy when it is available
+    def sort(self):
+        if np is not None:
+            values = np.frombuffer(self.map, dtype=np.int64, count=self.length, offset=self.HEADER.size)
+            values.sort()
+            del values
+        else:
+            self.items[:self.length] = array("q", sorted(self.items[:self.length]))
+
+    def flush(self):
+        self.map.flush()
+
+    def close(self):
+        self.flush()
+        self._unmap()
+        self.file.close()
+
+    def tolist(self):
+        return self.items[:self.length].tolist()
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.tolist()[index]
+        return self.items[self._checkIndex(index)]
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            values = self.tolist()
+            values[index] = value
+            values = array("q", values)
+            self.length = 0
+            self.extend(values)
+        else:
+            self.items[self._checkIndex(index)] = self._checkValue(value)
+
+    # By index: a live slice of the map would block growing the file
+    def __iter__(self):
+        index = 0
+        while index < self.length:
+            yield self.items[index]
+            index += 1
+
+
 class Tree:
     class TreeNode:
+        # No per-node __dict__: 72 bytes per node plus the key object
+        # (CompactTree below needs 24 bytes per integer key)
+        __slots__ = ("data", "left", "right", "height", "size")
+
         def __init__(self, data):
             self.data = data
             self.left = None
             self.right = None
+            # Augmented fields, kept up to date along the insert/delete path
+            self.height = 0
+            self.size = 1
 
     def __init__(self):
         self.root = None
@@ -77,18 +509,93 @@ class Tree:
         if self.root is None:
             self.root = new_node
             return new_node
+        path = []
         current = self.root
         while True:
+            path.append(current)
             if value <= current.data:
                 if current.left is None:
                     current.left = new_node
-                    return new_node
+                    break
                 current = current.left
             else:
                 if current.right is None:
                     current.right = new_node
-                    return new_node
+                    break
                 current = current.right
+        self._updatePath(path)
+        return new_node
+
+    # Build a perfectly balanced tree, O(n) for sorted input, O(n log n) otherwise
+    @classmethod
+    def from_iterable(cls, values, presorted=False):
+        tree = cls()
+        values = list(values) if presorted else sorted(values)
+        tree.root = tree._buildBalanced(values, 0, len(values) - 1)
+        return tree
+
+    # Pre-order values plus one flag byte per node (1: has a left child,
+    # 2: has a right child). Equal keys can end up on either side after
+    # deletes and rotations, so the values alone do not fix the shape.
+    def to_preorder(self):
+        values = []
+        flags = bytearray()
+        stack = [self.root] if self.root is not None else []
+        while stack:
+            node = stack.pop()
+            values.append(node.data)
+            flags.append((node.left is not None) | (node.right is not None) << 1)
+            if node.right is not None:
+                stack.append(node.right)
+            if node.left is not None:
+                stack.append(node.left)
+        return values, bytes(flags)
+
+    # Rebuild the exact tree to_preorder came from, O(n). The stack holds
+    # the nodes still waiting for a child, the next value is that child.
+    @classmethod
+    def from_preorder(cls, values, flags):
+        tree = cls()
+        nodes = []
+        stack = []
+        for value, flag in zip(values, flags):
+            node = tree.TreeNode(value)
+            if tree.root is None:
+                tree.root = node
+            else:
+                pending = stack[-1]
+                if pending[1] & 1:
+                    pending[0].left = node
+                    pending[1] &= 2
+                else:
+                    pending[0].right = node
+                    pending[1] = 0
+                if not pending[1]:
+                    stack.pop()
+            if flag:
+                stack.append([node, flag])
+            nodes.append(node)
+        # Children come after their parent in pre-order, walking backwards
+        # refreshes every subtree before the node above it
+        for node in reversed(nodes):
+            tree._updateNode(node)
+        return tree
+
+    # Merge a batch into the tree and rebuild it balanced, O(n + m) plus sorting the batch
+    def bulk_insert(self, values, presorted=False):
+        batch = values if presorted else sorted(values)
+        merged = list(heapq.merge(self.iter_inorder(), batch))
+        self.root = self._buildBalanced(merged, 0, len(merged) - 1)
+
+    def _buildBalanced(self, values, lo, hi):
+        if lo > hi:
+            return None
+        mid = (lo + hi) // 2
+        node = self.TreeNode(values[mid])
+        node.left = self._buildBalanced(values, lo, mid - 1)
+        node.right = self._buildBalanced(values, mid + 1, hi)
+        self._updateNode(node)
+        return node
 
     # Get inorder successor (smallest in right subtree)
     def getSuccessor(self, curr):
@@ -97,35 +604,101 @@ class Tree:
             curr = curr.left
         return curr
 
-    # Delete a node with value x from BST
+    # Delete a node with value x from BST, returns the new root
     def delNode(self, root, x):
-        if root is None:
+        path = []
+        current = root
+        while current is not None and current.data != x:
+            path.append(current)
+            current = current.left if x < current.data else current.right
+
+        if current is None:
             return root
 
-        if root.data > x:
-            root.left = self.delNode(root.left, x)
-        elif root.data < x:
-            root.right = self.delNode(root.right, x)
-        else:
-            
-            # node with 0 or 1  children
-            if root.left is None:
-                return root.right
-            if root.right is None:
-                return root.left
-            
-            #  Node with 2 children
-            succ = self.getSuccessor(root)
-            root.data = succ.data
-            root.right = self.delNode(root.right, succ.data)
+        #  Node with 2 children: copy the successor and delete it instead
+        if current.left is not None and current.right is not None:
+            path.append(current)
+            succ = current.right
+            while succ.left is not None:
+                path.append(succ)
+                succ = succ.left
+            current.data = succ.data
+            current = succ
 
+        # node with 0 or 1  children
+        child = current.left if current.left is not None else current.right
+        if not path:
+            return child
+        parent = path[-1]
+        if parent.left is current:
+            parent.left = child
+        else:
+            parent.right = child
+        self._updatePath(path)
         return root
 
+    # Heights are stored in the nodes, so this is O(1)
     def getHeight(self, root, h):
         if root is None:
             return h - 1
-        return max(self.getHeight(root.left, h + 1),
-                self.getHeight(root.right, h + 1))
+        return h + root.height
+
+    def size(self):
+        return self._nodeSize(self.root)
+
+    def _nodeHeight(self, node):
+        return node.height if node is not None else -1
+
+    def _nodeSize(self, node):
+        return node.size if node is not None else 0
+
+    def _updateNode(self, node):
+        node.height = 1 + max(self._nodeHeight(node.left), self._nodeHeight(node.right))
+        node.size = 1 + self._nodeSize(node.left) + self._nodeSize(node.right)
+
+    # Refresh the augmented fields from the deepest node of the path up
+    def _updatePath(self, path):
+        for node in reversed(path):
+            self._updateNode(node)
+
+    # Number of values strictly smaller than x
+    def rank(self, x):
+        count = 0
+        node = self.root
+        while node is not None:
+            if x <= node.data:
+                node = node.left
+            else:
+                count += self._nodeSize(node.left) + 1
+                node = node.right
+        return count
+
+    # Value at in-order position k (0 based), None if out of range
+    def select(self, k):
+        if k < 0 or k >= self.size():
+            return None
+        node = self.root
+        while True:
+            left_size = self._nodeSize(node.left)
+            if k < left_size:
+                node = node.left
+            elif k == left_size:
+                return node.data
+            else:
+                k -= left_size + 1
+                node = node.right
+
+    # k-th smallest value (1 based)
+    def kth_smallest(self, k):
+        return self.select(k - 1)
+
+    def median(self):
+        n = self.size()
+        if n == 0:
+            return None
+        if n % 2 == 1:
+            return self.select(n // 2)
+        return (self.select(n // 2 - 1) + self.select(n // 2)) / 2
 
     # Return level-order as array [root, left, right, ...] (None for missing nodes)
     def levelOrder(self, root):
@@ -159,40 +732,542 @@ class Tree:
 
         return result
 
+    # Sparse layout for drawing, linear in the number of nodes.
+    # Returns (value, parent_index, depth, order) records in pre-order, where
+    # parent_index points into the same list (None for the root) and order is
+    # the in-order position of the node (its left-to-right x order).
+    def layout(self):
+        if self.root is None:
+            return []
+
+        order = {}
+        current = self.root
+        stack = []
+        while stack or current is not None:
+            while current is not None:
+                stack.append(current)
+                current = current.left
+            current = stack.pop()
+            order[id(current)] = len(order)
+            current = current.right
+
+        records = []
+        stack = [(self.root, None, 0)]
+        while stack:
+            node, parent, depth = stack.pop()
+            index = len(records)
+            records.append((node.data, parent, depth, order[id(node)]))
+            if node.right is not None:
+                stack.append((node.right, index, depth + 1))
+            if node.left is not None:
+                stack.append((node.left, index, depth + 1))
+        return records
+
+    # Lazy iterative traversals, start at node (root by default)
+    def iter_inorder(self, node=None):
+        current = self.root if node is None else node
+        stack = []
+        while stack or current is not None:
+            while current is not None:
+                stack.append(current)
+                current = current.left
+            current = stack.pop()
+            yield current.data
+            current = current.right
+
+    def iter_preorder(self, node=None):
+        start = self.root if node is None else node
+        stack = [start] if start is not None else []
+        while stack:
+            current = stack.pop()
+            yield current.data
+            if current.right is not None:
+                stack.append(current.right)
+            if current.left is not None:
+                stack.append(current.left)
+
+    def iter_postorder(self, node=None):
+        current = self.root if node is None else node
+        stack = []
+        last_visited = None
+        while stack or current is not None:
+            while current is not None:
+                stack.append(current)
+                current = current.left
+            top = stack[-1]
+            if top.right is not None and top.right is not last_visited:
+                current = top.right
+            else:
+                yield top.data
+                last_visited = stack.pop()
+
+    def iter_levelorder(self, node=None):
+        start = self.root if node is None else node
+        q = deque([start] if start is not None else [])
+        while q:
+            current = q.popleft()
+            yield current.data
+            if current.left is not None:
+                q.append(current.left)
+            if current.right is not None:
+                q.append(current.right)
+
+    # Lazy in-order values between lo and hi, skipping subtrees outside the range
+    def range(self, lo, hi, inclusive=True):
+        stack = []
+        node = self.root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                go_left = node.data >= lo if inclusive else node.data > lo
+                node = node.left if go_left else None
+            node = stack.pop()
+            if node.data > hi or (not inclusive and node.data == hi):
+                return
+            if node.data > lo or (inclusive and node.data == lo):
+                yield node.data
+            node = node.right
+
     def preOrderTraversal(self, node):
         if node is None:
-            return "Tree is empty"
-        print(node.data, end=", ")
-        self.preOrderTraversal(node.left)
-        self.preOrderTraversal(node.right)
+            return []
+        return list(self.iter_preorder(node))
 
     def inOrderTraversal(self, node):
         if node is None:
-            return
-        self.inOrderTraversal(node.left)
-        print(node.data, end=", ")
-        self.inOrderTraversal(node.right)
+            return []
+        return list(self.iter_inorder(node))
 
     def postOrderTraversal(self, node):
         if node is None:
-            return
-        self.postOrderTraversal(node.left)
-        self.postOrderTraversal(node.right)
-        print(node.data, end=", ")
+            return []
+        return list(self.iter_postorder(node))
 
     def search(self, node, target):
+        while node is not None and node.data != target:
+            node = node.left if target < node.data else node.right
+        return node
+
+
+# Self-balancing (AVL) version of Tree, same API so the page can switch between them
+class AVLTree(Tree):
+    def insert(self, value):
+        new_node = self.TreeNode(value)
+        self.root = self._insert(self.root, new_node)
+        return new_node
+
+    def _insert(self, node, new_node):
         if node is None:
-            return None 
-        elif node.data == target:
-            return node
-        elif target < node.data:
-            return self.search(node.left, target)
+            return new_node
+        if new_node.data <= node.data:
+            node.left = self._insert(node.left, new_node)
+        else:
+            node.right = self._insert(node.right, new_node)
+        return self._rebalance(node)
+
+    # Delete a node with value x, rebalancing on the way back up
+    def delNode(self, root, x):
+        if root is None:
+            return root
+
+        if root.data > x:
+            root.left = self.delNode(root.left, x)
+        elif root.data < x:
+            root.right = self.delNode(root.right, x)
+        else:
+            if root.left is None:
+                return root.right
+            if root.right is None:
+                return root.left
+
+            succ = self.getSuccessor(root)
+            root.data = succ.data
+            root.right = self.delNode(root.right, succ.data)
+
+        return self._rebalance(root)
+
+    def _rotateRight(self, node):
+        pivot = node.left
+        node.left = pivot.right
+        pivot.right = node
+        self._updateNode(node)
+        self._updateNode(pivot)
+        return pivot
+
+    def _rotateLeft(self, node):
+        pivot = node.right
+        node.right = pivot.left
+        pivot.left = node
+        self._updateNode(node)
+        self._updateNode(pivot)
+        return pivot
+
+    def _rebalance(self, node):
+        self._updateNode(node)
+        balance = self._nodeHeight(node.left) - self._nodeHeight(node.right)
+
+        if balance > 1:
+            if self._nodeHeight(node.left.left) < self._nodeHeight(node.left.right):
+                node.left = self._rotateLeft(node.left)
+            return self._rotateRight(node)
+
+        if balance < -1:
+            if self._nodeHeight(node.right.right) < self._nodeHeight(node.right.left):
+                node.right = self._rotateRight(node.right)
+            return self._rotateLeft(node)
+
+        return node
+
+
+
+# Tree with its nodes stored in parallel arrays instead of Python objects
+# (integer keys only). Node handles are indexes into the arrays, so the Tree
+# API stays the same. The read paths are written out again over the arrays
+# rather than shared with Tree, so neither pays for an accessor call per node.
+# Each node takes 24 bytes: an int64 key plus int32 left/right/height/size;
+# deleted slots are reused through a free list.
+class CompactTree(Tree):
+    NIL = -1
+
+    def __init__(self):
+        self.root = None
+        self._clear()
+
+    def _clear(self):
+        self.keys = array("q")
+        self.lefts = array("i")
+        self.rights = array("i")
+        self.heights = array("i")
+        self.sizes = array("i")
+        # Free slots are chained through lefts
+        self.free_head = self.NIL
+
+    def _newNode(self, value):
+        index = self.free_head
+        if index == self.NIL:
+            index = len(self.keys)
+            self.keys.append(value)
+            self.lefts.append(self.NIL)
+            self.rights.append(self.NIL)
+            self.heights.append(0)
+            self.sizes.append(1)
+        else:
+            self.keys[index] = value
+            self.free_head = self.lefts[index]
+            self.lefts[index] = self.NIL
+            self.rights[index] = self.NIL
+            self.heights[index] = 0
+            self.sizes[index] = 1
+        return index
+
+    def _freeNode(self, index):
+        self.lefts[index] = self.free_head
+        self.free_head = index
+
+    def insert(self, value):
+        new_node = self._newNode(value)
+        if self.root is None:
+            self.root = new_node
+            return new_node
+        keys, lefts, rights = self.keys, self.lefts, self.rights
+        path = []
+        current = self.root
+        while True:
+            path.append(current)
+            if value <= keys[current]:
+                if lefts[current] == self.NIL:
+                    lefts[current] = new_node
+                    break
+                current = lefts[current]
+            else:
+                if rights[current] == self.NIL:
+                    rights[current] = new_node
+                    break
+                current = rights[current]
+        self._updatePath(path)
+        return new_node
+
+    def to_preorder(self):
+        lefts, rights, nil = self.lefts, self.rights, self.NIL
+        order = list(self._preorderNodes())
+        flags = bytes((lefts[node] != nil) | (rights[node] != nil) << 1 for node in order)
+        return [self.keys[node] for node in order], flags
+
+    @classmethod
+    def from_preorder(cls, values, flags):
+        tree = cls()
+        lefts, rights = tree.lefts, tree.rights
+        stack = []
+        for value, flag in zip(values, flags):
+            node = tree._newNode(value)
+            if tree.root is None:
+                tree.root = node
+            else:
+                pending = stack[-1]
+                if pending[1] & 1:
+                    lefts[pending[0]] = node
+                    pending[1] &= 2
+                else:
+                    rights[pending[0]] = node
+                    pending[1] = 0
+                if not pending[1]:
+                    stack.pop()
+            if flag:
+                stack.append([node, flag])
+        # A fresh tree hands out indexes in pre-order
+        for node in reversed(range(len(tree.keys))):
+            tree._updateNode(node)
+        return tree
+
+    def bulk_insert(self, values, presorted=False):
+        batch = values if presorted else sorted(values)
+        merged = list(heapq.merge(self.iter_inorder(), batch))
+        # Checked before clearing, a failed load keeps the current tree
+        if merged and (merged[0] < -2 ** 63 or merged[-1] >= 2 ** 63):
+            raise OverflowError("CompactTree keys must fit in 64 bits")
+        self._clear()
+        self.root = self._buildBalanced(merged, 0, len(merged) - 1)
+
+    def _buildBalanced(self, values, lo, hi):
+        if lo > hi:
+            return None
+        mid = (lo + hi) // 2
+        node = self._newNode(values[mid])
+        left = self._buildBalanced(values, lo, mid - 1)
+        right = self._buildBalanced(values, mid + 1, hi)
+        self.lefts[node] = self.NIL if left is None else left
+        self.rights[node] = self.NIL if right is None else right
+        self._updateNode(node)
+        return node
+
+    def delNode(self, root, x):
+        keys, lefts, rights = self.keys, self.lefts, self.rights
+        path = []
+        current = self.NIL if root is None else root
+        while current != self.NIL and keys[current] != x:
+            path.append(current)
+            current = lefts[current] if x < keys[current] else rights[current]
+
+        if current == self.NIL:
+            return root
+
+        if lefts[current] != self.NIL and rights[current] != self.NIL:
+            path.append(current)
+            succ = rights[current]
+            while lefts[succ] != self.NIL:
+                path.append(succ)
+                succ = lefts[succ]
+            keys[current] = keys[succ]
+            current = succ
+
+        child = lefts[current] if lefts[current] != self.NIL else rights[current]
+        self._freeNode(current)
+        if not path:
+            return None if child == self.NIL else child
+        parent = path[-1]
+        if lefts[parent] == current:
+            lefts[parent] = child
         else:
-            return self.search(node.right, target)
+            rights[parent] = child
+        self._updatePath(path)
+        return root
+
+    # Read paths over the arrays, children are NIL (-1) and the empty tree or
+    # a missing node handed back to callers is None, like Tree's nodes
+    def getSuccessor(self, curr):
+        lefts = self.lefts
+        curr = self.rights[curr]
+        while curr != self.NIL and lefts[curr] != self.NIL:
+            curr = lefts[curr]
+        return None if curr == self.NIL else curr
+
+    def getHeight(self, root, h):
+        if root is None:
+            return h - 1
+        return h + self.heights[root]
+
+    def size(self):
+        return 0 if self.root is None else self.sizes[self.root]
+
+    def _nodeHeight(self, node):
+        return -1 if node == self.NIL else self.heights[node]
+
+    def _nodeSize(self, node):
+        return 0 if node == self.NIL else self.sizes[node]
+
+    def _updateNode(self, node):
+        left, right = self.lefts[node], self.rights[node]
+        self.heights[node] = 1 + max(self._nodeHeight(left), self._nodeHeight(right))
+        self.sizes[node] = 1 + self._nodeSize(left) + self._nodeSize(right)
+
+    def rank(self, x):
+        keys, lefts, rights, sizes, nil = self.keys, self.lefts, self.rights, self.sizes, self.NIL
+        count = 0
+        node = nil if self.root is None else self.root
+        while node != nil:
+            if x <= keys[node]:
+                node = lefts[node]
+            else:
+                left = lefts[node]
+                count += (sizes[left] if left != nil else 0) + 1
+                node = rights[node]
+        return count
+
+    def select(self, k):
+        if k < 0 or k >= self.size():
+            return None
+        keys, lefts, rights, sizes, nil = self.keys, self.lefts, self.rights, self.sizes, self.NIL
+        node = self.root
+        while True:
+            left = lefts[node]
+            left_size = sizes[left] if left != nil else 0
+            if k < left_size:
+                node = left
+            elif k == left_size:
+                return keys[node]
+            else:
+                k -= left_size + 1
+                node = rights[node]
+
+    def levelOrder(self, root):
+        if root is None:
+            return []
+
+        height = self.getHeight(root, 0)
+        q = deque()
+        q.append((root, 0))
+        result = []
+
+        while q:
+            node, lvl = q.popleft()
+            if node == self.NIL:
+                result.append(None)
+                continue
+
+            result.append(self.keys[node])
+
+            if lvl < height:
+                q.append((self.lefts[node], lvl + 1))
+                q.append((self.rights[node], lvl + 1))
+
+        while result and result[-1] is None:
+            result.pop()
+
+        return result
+
+    def layout(self):
+        if self.root is None:
+            return []
+
+        keys, lefts, rights, nil = self.keys, self.lefts, self.rights, self.NIL
+        order = {node: position for position, node in enumerate(self._inorderNodes(self.root))}
+
+        records = []
+        stack = [(self.root, None, 0)]
+        while stack:
+            node, parent, depth = stack.pop()
+            index = len(records)
+            records.append((keys[node], parent, depth, order[node]))
+            if rights[node] != nil:
+                stack.append((rights[node], index, depth + 1))
+            if lefts[node] != nil:
+                stack.append((lefts[node], index, depth + 1))
+        return records
+
+    # Node indexes in in-order
+    def _inorderNodes(self, start):
+        lefts, rights, nil = self.lefts, self.rights, self.NIL
+        current = nil if start is None else start
+        stack = []
+        while stack or current != nil:
+            while current != nil:
+                stack.append(current)
+                current = lefts[current]
+            current = stack.pop()
+            yield current
+            current = rights[current]
+
+    def iter_inorder(self, node=None):
+        keys = self.keys
+        for index in self._inorderNodes(self.root if node is None else node):
+            yield keys[index]
+
+    # Node indexes in pre-order
+    def _preorderNodes(self, start=None):
+        lefts, rights, nil = self.lefts, self.rights, self.NIL
+        start = self.root if start is None else start
+        stack = [start] if start is not None else []
+        while stack:
+            current = stack.pop()
+            yield current
+            if rights[current] != nil:
+                stack.append(rights[current])
+            if lefts[current] != nil:
+                stack.append(lefts[current])
+
+    def iter_preorder(self, node=None):
+        keys = self.keys
+        for index in self._preorderNodes(node):
+            yield keys[index]
+
+    def iter_postorder(self, node=None):
+        keys, lefts, rights, nil = self.keys, self.lefts, self.rights, self.NIL
+        current = self.root if node is None else node
+        current = nil if current is None else current
+        stack = []
+        last_visited = nil
+        while stack or current != nil:
+            while current != nil:
+                stack.append(current)
+                current = lefts[current]
+            top = stack[-1]
+            if rights[top] != nil and rights[top] != last_visited:
+                current = rights[top]
+            else:
+                yield keys[top]
+                last_visited = stack.pop()
+
+    def iter_levelorder(self, node=None):
+        keys, lefts, rights, nil = self.keys, self.lefts, self.rights, self.NIL
+        start = self.root if node is None else node
+        q = deque([start] if start is not None else [])
+        while q:
+            current = q.popleft()
+            yield keys[current]
+            if lefts[current] != nil:
+                q.append(lefts[current])
+            if rights[current] != nil:
+                q.append(rights[current])
+
+    def range(self, lo, hi, inclusive=True):
+        keys, lefts, rights, nil = self.keys, self.lefts, self.rights, self.NIL
+        stack = []
+        node = nil if self.root is None else self.root
+        while stack or node != nil:
+            while node != nil:
+                stack.append(node)
+                go_left = keys[node] >= lo if inclusive else keys[node] > lo
+                node = lefts[node] if go_left else nil
+            node = stack.pop()
+            data = keys[node]
+            if data > hi or (not inclusive and data == hi):
+                return
+            if data > lo or (inclusive and data == lo):
+                yield data
+            node = rights[node]
+
+    def search(self, node, target):
+        keys, lefts, rights, nil = self.keys, self.lefts, self.rights, self.NIL
+        node = nil if node is None else node
+        while node != nil and keys[node] != target:
+            node = lefts[node] if target < keys[node] else rights[node]
+        return None if node == nil else node
 
 
 class CircularList:
     class Node:
+        __slots__ = ("data", "next")
+
         def __init__(self, data):
             self.data = data
             self.next = None
@@ -200,22 +1275,34 @@ class CircularList:
     def __init__(self):
         self.size = 0
         self.head = None
+        # tail.next is always head, keeping it makes push/pop/head inserts O(1)
+        self.tail = None
+        # title -> nodes holding it (dict used as an ordered set)
+        self.index = {}
+    
+    def _indexAdd(self, node):
+        self.index.setdefault(node.data, {})[node] = None
+    
+    def _indexRemove(self, node):
+        nodes = self.index[node.data]
+        del nodes[node]
+        if not nodes:
+            del self.index[node.data]
     
     def push(self, data):
         new_node = self.Node(data)
+        self._indexAdd(new_node)
         
         if self.head is None:
             self.head = new_node
+            self.tail = new_node
             new_node.next = self.head
             self.size += 1
             return new_node
         
-        current = self.head
-        while current.next != self.head:
-            current = current.next
-        
-        current.next = new_node
+        self.tail.next = new_node
         new_node.next = self.head
+        self.tail = new_node
         self.size += 1
         return new_node
     
@@ -225,17 +1312,15 @@ class CircularList:
         
         if position == 0:
             new_node = self.Node(data)
+            self._indexAdd(new_node)
             
             if self.head is None:
                 self.head = new_node
+                self.tail = new_node
                 new_node.next = self.head
             else:
-                current = self.head
-                while current.next != self.head:
-                    current = current.next
-                
                 new_node.next = self.head
-                current.next = new_node
+                self.tail.next = new_node
                 self.head = new_node
             
             self.size += 1
@@ -245,6 +1330,7 @@ class CircularList:
             return self.push(data)
         
         new_node = self.Node(data)
+        self._indexAdd(new_node)
         current = self.head
         
         for i in range(position - 1):
@@ -259,18 +1345,17 @@ class CircularList:
         if self.head is None:
             return "List is Empty!"
         
+        self._indexRemove(self.head)
+        
         if self.size == 1:
             data = self.head.data
             self.head = None
+            self.tail = None
             self.size = 0
             return data
         
-        current = self.head
-        while current.next != self.head:
-            current = current.next
-        
         data = self.head.data
-        current.next = self.head.next
+        self.tail.next = self.head.next
         self.head = self.head.next
         self.size -= 1
         return data
@@ -290,11 +1375,63 @@ class CircularList:
             current = current.next
         
         deleted_data = current.next.data
+        self._indexRemove(current.next)
         
+        if current.next is self.tail:
+            self.tail = current
         current.next = current.next.next
         self.size -= 1
         return deleted_data
     
+    # Move the head one node forward, the old head becomes the tail
+    def rotate(self):
+        if self.head is not None:
+            self.tail = self.head
+            self.head = self.head.next
+    
+    # Splice all nodes of other after the tail, other is left empty
+    def concat(self, other):
+        if other.head is None:
+            return
+        
+        if self.head is None:
+            self.head, self.tail = other.head, other.tail
+        else:
+            self.tail.next = other.head
+            other.tail.next = self.head
+            self.tail = other.tail
+        
+        self.size += other.size
+        for title, nodes in other.index.items():
+            self.index.setdefault(title, {}).update(nodes)
+        other.head = other.tail = None
+        other.size = 0
+        other.index = {}
+    
+    # Is the title in the list? O(1) through the index
+    def contains(self, title):
+        return title in self.index
+    
+    def count(self, title):
+        return len(self.index.get(title, ()))
+    
+    # Positions holding the title; titles not in the list are answered from the
+    # index without walking the ring
+    def positions_of(self, title):
+        nodes = self.index.get(title)
+        if not nodes:
+            return []
+        
+        positions = []
+        current = self.head
+        for position in range(self.size):
+            if current in nodes:
+                positions.append(position)
+                if len(positions) == len(nodes):
+                    break
+            current = current.next
+        return positions
+    
     def get_at(self, position):
         if self.head is None or position < 0 or position >= self.size:
             return None
@@ -339,4 +1476,432 @@ class CircularList:
         return self.head is None
     
     def get_size(self):
-        return self.size
\ No newline at end of file
+        return self.size
+
+# CircularList backed by an indexable skip list: get_at, insert_at and
+# delete_at are O(log n) expected instead of walking from head. Level 0 is
+# still the ring of next pointers, so display/traverse/index work unchanged.
+class IndexedCircularList(CircularList):
+    MAX_LEVEL = 32
+
+    class Node(CircularList.Node):
+        # forward/width hold the links of levels 1 and up; width is the
+        # number of positions skipped by each link
+        __slots__ = ("forward", "width")
+
+        def __init__(self, data, levels=0):
+            super().__init__(data)
+            self.forward = [None] * levels
+            self.width = [0] * levels
+
+    def __init__(self):
+        super().__init__()
+        self.header = self.Node(None, self.MAX_LEVEL - 1)
+        self.level = 1
+
+    def _randomLevel(self):
+        level = 1
+        while level < self.MAX_LEVEL and random.random() < 0.5:
+            level += 1
+        return level
+
+    def _link(self, node, level):
+        if level == 0:
+            if node is self.header:
+                return self.head
+            return None if node is self.tail else node.next
+        return node.forward[level - 1]
+
+    # Last node before position on every level (header = position -1)
+    def _predecessors(self, position):
+        update = [self.header] * self.MAX_LEVEL
+        update_pos = [-1] * self.MAX_LEVEL
+        node = self.header
+        pos = -1
+        for level in range(self.level - 1, -1, -1):
+            while True:
+                next_node = self._link(node, level)
+                step = 1 if level == 0 else node.width[level - 1]
+                if next_node is None or pos + step >= position:
+                    break
+                node = next_node
+                pos += step
+            update[level] = node
+            update_pos[level] = pos
+        return update, update_pos
+
+    def push(self, data):
+        return self.insert_at(self.size, data)
+
+    def insert_at(self, position, data):
+        if position < 0 or position > self.size:
+            return "Invalid position"
+
+        new_node = self.Node(data, self._randomLevel() - 1)
+        self._indexAdd(new_node)
+        self._insertNode(position, new_node)
+        return new_node
+
+    # Link a node (already sized to its levels) in at position
+    def _insertNode(self, position, new_node):
+        levels = len(new_node.forward) + 1
+        update, update_pos = self._predecessors(position)
+        self.level = max(self.level, levels)
+
+        # Level 0: the ring itself
+        if self.head is None:
+            self.head = self.tail = new_node
+            new_node.next = new_node
+        else:
+            pred = update[0]
+            if pred is self.header:
+                new_node.next = self.head
+                self.tail.next = new_node
+                self.head = new_node
+            else:
+                new_node.next = pred.next
+                pred.next = new_node
+                if pred is self.tail:
+                    self.tail = new_node
+
+        for level in range(1, self.level):
+            pred = update[level]
+            if level < levels:
+                old_next = pred.forward[level - 1]
+                new_node.forward[level - 1] = old_next
+                if old_next is not None:
+                    new_node.width[level - 1] = update_pos[level] + pred.width[level - 1] + 1 - position
+                pred.forward[level - 1] = new_node
+                pred.width[level - 1] = position - update_pos[level]
+            elif pred.forward[level - 1] is not None:
+                pred.width[level - 1] += 1
+
+        self.size += 1
+
+    def pop(self):
+        return self.delete_at(0)
+
+    def delete_at(self, position):
+        if self.head is None:
+            return "List is Empty!"
+
+        if position < 0 or position >= self.size:
+            return "Invalid position"
+
+        target = self._removeNode(position)
+        self._indexRemove(target)
+        return target.data
+
+    # Unlink the node at position from every level and return it
+    def _removeNode(self, position):
+        update, _ = self._predecessors(position)
+        target = self._link(update[0], 0)
+
+        for level in range(1, self.level):
+            pred = update[level]
+            if pred.forward[level - 1] is target:
+                pred.forward[level - 1] = target.forward[level - 1]
+                pred.width[level - 1] += target.width[level - 1] - 1
+            elif pred.forward[level - 1] is not None:
+                pred.width[level - 1] -= 1
+
+        if self.size == 1:
+            self.head = self.tail = None
+        elif target is self.head:
+            self.head = target.next
+            self.tail.next = self.head
+        else:
+            update[0].next = target.next
+            if target is self.tail:
+                self.tail = update[0]
+
+        while self.level > 1 and self.header.forward[self.level - 2] is None:
+            self.level -= 1
+
+        self.size -= 1
+        return target
+
+    def get_at(self, position):
+        if self.head is None or position < 0 or position >= self.size:
+            return None
+        update, _ = self._predecessors(position)
+        return self._link(update[0], 0).data
+
+    # The head node itself moves behind the tail: unlinking it from the front
+    # is O(levels) and relinking it at the end O(log n) expected
+    def rotate(self):
+        if self.size > 1:
+            node = self._removeNode(0)
+            node.forward = [None] * len(node.forward)
+            node.width = [0] * len(node.width)
+            self._insertNode(self.size, node)
+
+    # Splice other after the tail in O(log n + log m) expected: on each level
+    # the last node here links to other's first node, widths offset by
+    # self.size. The title index is merged as in CircularList.
+    def concat(self, other):
+        if not isinstance(other, IndexedCircularList):
+            while not other.is_empty():
+                self.push(other.pop())
+            return
+        if other.head is None:
+            return
+
+        update, update_pos = self._predecessors(self.size)
+        for level in range(1, other.level):
+            first = other.header.forward[level - 1]
+            if first is not None:
+                pred = update[level]
+                pred.forward[level - 1] = first
+                pred.width[level - 1] = self.size + other.header.width[level - 1] - 1 - update_pos[level]
+        self.level = max(self.level, other.level)
+
+        # Level 0, size and index like the plain ring; other is left empty
+        super().concat(other)
+        other.header = other.Node(None, other.MAX_LEVEL - 1)
+        other.level = 1
+
+
+# Undirected weighted graph stored as dict of dicts, vertex -> {neighbor: weight},
+# so edge checks and weight lookups are O(1) instead of scanning neighbor lists.
+# version goes up on every change, caches compare it to know they are stale.
+class Graph:
+    def __init__(self):
+        self.adjacency = {}
+        self.edges_count = 0
+        self.version = 0
+
+    def add_vertex(self, vertex):
+        if vertex in self.adjacency:
+            return False
+        self.adjacency[vertex] = {}
+        self.version += 1
+        return True
+
+    # False when a vertex is missing or the edge already exists
+    def add_edge(self, from_v, to_v, weight):
+        if from_v not in self.adjacency or to_v not in self.adjacency:
+            return False
+        if to_v in self.adjacency[from_v]:
+            return False
+        self.adjacency[from_v][to_v] = weight
+        self.adjacency[to_v][from_v] = weight
+        self.edges_count += 1
+        self.version += 1
+        return True
+
+    def remove_edge(self, from_v, to_v):
+        if not self.has_edge(from_v, to_v):
+            return False
+        del self.adjacency[from_v][to_v]
+        self.adjacency[to_v].pop(from_v, None)
+        self.edges_count -= 1
+        self.version += 1
+        return True
+
+    def has_edge(self, from_v, to_v):
+        return from_v in self.adjacency and to_v in self.adjacency[from_v]
+
+    # Weight of the edge, None if there is no such edge
+    def weight(self, from_v, to_v):
+        neighbors = self.adjacency.get(from_v)
+        return neighbors.get(to_v) if neighbors is not None else None
+
+    def neighbors(self, vertex):
+        return self.adjacency[vertex].items()
+
+    def degree(self, vertex):
+        return len(self.adjacency[vertex])
+
+    def vertices(self):
+        return list(self.adjacency)
+
+    # Each undirected edge once, as (from, to, weight)
+    def edges(self):
+        done = set()
+        for from_v, neighbors in self.adjacency.items():
+            for to_v, weight in neighbors.items():
+                if to_v not in done:
+                    yield (from_v, to_v, weight)
+            done.add(from_v)
+
+    def vertex_count(self):
+        return len(self.adjacency)
+
+    def edge_count(self):
+        return self.edges_count
+
+    def clear(self):
+        self.adjacency = {}
+        self.edges_count = 0
+        self.version += 1
+
+    def __contains__(self, vertex):
+        return vertex in self.adjacency
+
+    def __iter__(self):
+        return iter(self.adjacency)
+
+    def __len__(self):
+        return len(self.adjacency)
+
+
+# Disjoint sets over vertices of any hashable type. Each vertex is interned
+# once to a dense integer id; parent/rank are array('i') buffers and find is
+# iterative with path halving, so the inner loop only touches ints.
+class UnionFind:
+    def __init__(self, vertices=()):
+        self.ids = {}
+        self.vertices = []
+        self.parent = array("i")
+        self.rank = array("i")
+        for vertex in vertices:
+            self.add(vertex)
+
+    # Id of vertex, added as its own set if new
+    def add(self, vertex):
+        vertex_id = self.ids.get(vertex)
+        if vertex_id is None:
+            vertex_id = len(self.vertices)
+            self.ids[vertex] = vertex_id
+            self.vertices.append(vertex)
+            self.parent.append(vertex_id)
+            self.rank.append(0)
+        return vertex_id
+
+    def find_id(self, vertex_id):
+        parent = self.parent
+        while parent[vertex_id] != vertex_id:
+            # Path halving: point to the grandparent and jump there
+            parent[vertex_id] = parent[parent[vertex_id]]
+            vertex_id = parent[vertex_id]
+        return vertex_id
+
+    def union_ids(self, id1, id2):
+        root1 = self.find_id(id1)
+        root2 = self.find_id(id2)
+
+        if root1 == root2:
+            return False
+
+        rank = self.rank
+        if rank[root1] < rank[root2]:
+            self.parent[root1] = root2
+        elif rank[root1] > rank[root2]:
+            self.parent[root2] = root1
+        else:
+            self.parent[root2] = root1
+            rank[root1] += 1
+
+        return True
+
+    # Representative vertex of the set holding vertex
+    def find(self, vertex):
+        return self.vertices[self.find_id(self.ids[vertex])]
+
+    def union(self, v1, v2):
+        return self.union_ids(self.ids[v1], self.ids[v2])
+
+    def connected(self, v1, v2):
+        return self.find_id(self.ids[v1]) == self.find_id(self.ids[v2])
+
+    # Union every (id1, id2) pair of interned ids, returns how many sets were merged
+    def union_many(self, id_pairs):
+        union_ids = self.union_ids
+        merged = 0
+        for id1, id2 in id_pairs:
+            if union_ids(id1, id2):
+                merged += 1
+        return merged
+
+    def __len__(self):
+        return len(self.vertices)
+
+
+# Minimum spanning forest kept up to date while the graph grows. A new edge
+# (u, v, w) either joins two trees, or closes a cycle; then the heaviest edge
+# on the forest path u -> v is swapped out if w is lighter. That is O(V) per
+# edge instead of re-running Kruskal. Swaps never change which vertices are
+# connected, so a union-find answers "same tree?" without walking the path.
+class MinimumSpanningForest:
+    # edges is an already computed MST of graph; without it Kruskal's is run
+    def __init__(self, graph=None, edges=None):
+        self.forest = Graph()
+        self.components = UnionFind()
+        self.total_weight = 0
+        if graph is None:
+            return
+
+        for vertex in graph:
+            self.add_vertex(vertex)
+        ids = self.components.ids
+        if edges is not None:
+            # Already a forest, so every pair merges two sets
+            self.components.union_many((ids[from_v], ids[to_v]) for from_v, to_v, _ in edges)
+            for from_v, to_v, weight in edges:
+                self._link(from_v, to_v, weight)
+            return
+
+        # Endpoints interned once, Kruskal's loop only compares ids
+        edges = sorted(graph.edges(), key=lambda edge: edge[2])
+        id_pairs = [(ids[from_v], ids[to_v]) for from_v, to_v, _ in edges]
+        union_ids = self.components.union_ids
+        for (from_id, to_id), (from_v, to_v, weight) in zip(id_pairs, edges):
+            if union_ids(from_id, to_id):
+                self._link(from_v, to_v, weight)
+
+    def add_vertex(self, vertex):
+        self.forest.add_vertex(vertex)
+        self.components.add(vertex)
+
+    # Returns True if the forest changed
+    def add_edge(self, from_v, to_v, weight):
+        if from_v == to_v:
+            return False
+        ids = self.components.ids
+        if self.components.union_ids(ids[from_v], ids[to_v]):
+            self._link(from_v, to_v, weight)
+            return True
+
+        heaviest = self._heaviestOnPath(from_v, to_v)
+        if heaviest[2] <= weight:
+            return False
+        self.forest.remove_edge(heaviest[0], heaviest[1])
+        self.total_weight -= heaviest[2]
+        self._link(from_v, to_v, weight)
+        return True
+
+    def _link(self, from_v, to_v, weight):
+        self.forest.add_edge(from_v, to_v, weight)
+        self.total_weight += weight
+
+    # Heaviest (from, to, weight) edge on the forest path between two
+    # connected vertices, found with a BFS from one end
+    def _heaviestOnPath(self, from_v, to_v):
+        parent = {from_v: None}
+        pending = deque([from_v])
+        while to_v not in parent:
+            vertex = pending.popleft()
+            for neighbor in self.forest.adjacency[vertex]:
+                if neighbor not in parent:
+                    parent[neighbor] = vertex
+                    pending.append(neighbor)
+
+        heaviest = None
+        vertex = to_v
+        while parent[vertex] is not None:
+            weight = self.forest.adjacency[vertex][parent[vertex]]
+            if heaviest is None or weight > heaviest[2]:
+                heaviest = (parent[vertex], vertex, weight)
+            vertex = parent[vertex]
+        return heaviest
+
+    def edges(self):
+        return self.forest.edges()
+
+    def edge_count(self):
+        return self.forest.edge_count()
+
+    # True when the forest is a single tree over all vertices
+    def is_spanning_tree(self):
+        return self.forest.edge_count() == self.forest.vertex_count() - 1
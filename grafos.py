@@ -0,0 +1,522 @@
+import csv
+import heapq
+import math
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from multiprocessing import shared_memory
+
+from estructuras import UnionFind, np
+
+# From this many edges NumPy Borůvka beats Kruskal on sparse maps
+BORUVKA_MIN_EDGES = 5_000
+# Edge density (E / max possible E) from which Prim beats Kruskal
+DENSE_GRAPH = 0.1
+# Largest graph the all-pairs "auto" mode sends to Floyd–Warshall
+FLOYD_MAX_VERTICES = 1000
+# Below this many vertices per-source Dijkstra runs in this process
+PARALLEL_MIN_VERTICES = 2000
+
+
+# Each spanning tree of a forest is returned as (edges, total_weight), edges
+# as (from, to, weight). A disconnected graph gives fewer than V - 1 edges.
+def kruskal(graph):
+    uf = UnionFind(graph)
+    ids = uf.ids
+    sorted_edges = sorted(graph.edges(), key=lambda edge: edge[2])
+    # Endpoints interned once, the loop below only touches ints
+    id_pairs = [(ids[from_v], ids[to_v]) for from_v, to_v, _ in sorted_edges]
+    union_ids = uf.union_ids
+    edges = []
+    total = 0
+    needed = len(graph) - 1
+    for (from_id, to_id), (from_v, to_v, weight) in zip(id_pairs, sorted_edges):
+        if union_ids(from_id, to_id):
+            edges.append((from_v, to_v, weight))
+            total += weight
+            if len(edges) == needed:
+                break
+    return edges, total
+
+
+# Lazy Prim with a binary heap, restarted from every vertex not reached yet
+def prim(graph):
+    visited = set()
+    edges = []
+    total = 0
+    for start in graph:
+        if start in visited:
+            continue
+        visited.add(start)
+        heap = [(weight, start, neighbor) for neighbor, weight in graph.neighbors(start)]
+        heapq.heapify(heap)
+        while heap:
+            weight, from_v, to_v = heapq.heappop(heap)
+            if to_v in visited:
+                continue
+            visited.add(to_v)
+            edges.append((from_v, to_v, weight))
+            total += weight
+            for neighbor, next_weight in graph.neighbors(to_v):
+                if neighbor not in visited:
+                    heapq.heappush(heap, (next_weight, to_v, neighbor))
+    return edges, total
+
+
+# Borůvka over NumPy arrays: every round each component picks its cheapest
+# outgoing edge and they are all added at once, so at most log2(V) rounds.
+# Edges are ranked once by (weight, index), so a component's cheapest edge is
+# its lowest rank and equal weights can never close a cycle. Each round is a
+# few array passes over the edges still between two components.
+def boruvka(graph):
+    vertices = graph.vertices()
+    edge_list = list(graph.edges())
+    edge_count = len(edge_list)
+    if edge_count == 0:
+        return [], 0
+
+    intern = {vertex: i for i, vertex in enumerate(vertices)}.__getitem__
+    from_vertices, to_vertices, weights = zip(*edge_list)
+    edge_index = np.argsort(np.array(weights), kind="stable")
+    from_ids = np.fromiter(map(intern, from_vertices), dtype=np.int64, count=edge_count)[edge_index]
+    to_ids = np.fromiter(map(intern, to_vertices), dtype=np.int64, count=edge_count)[edge_index]
+    # Component label of every vertex: the id of one vertex of the component
+    labels = np.arange(len(vertices))
+    picked_edges = []
+
+    while True:
+        from_labels = labels[from_ids]
+        to_labels = labels[to_ids]
+        outgoing = from_labels != to_labels
+        if not outgoing.any():
+            break
+        # Edges inside a component never matter again
+        from_ids, to_ids, edge_index = from_ids[outgoing], to_ids[outgoing], edge_index[outgoing]
+        from_labels, to_labels = from_labels[outgoing], to_labels[outgoing]
+
+        remaining = len(edge_index)
+        best = np.full(len(vertices), remaining)
+        ranks = np.arange(remaining)
+        np.minimum.at(best, from_labels, ranks)
+        np.minimum.at(best, to_labels, ranks)
+        components = np.flatnonzero(best < remaining)
+        cheapest = best[components]
+
+        # Each component points at the one across its cheapest edge. Only two
+        # components that picked the same edge point at each other, the
+        # smaller one becomes the root of the merged component.
+        parent = np.arange(len(vertices))
+        across = np.where(from_labels[cheapest] == components,
+                          to_labels[cheapest], from_labels[cheapest])
+        parent[components] = across
+        mutual = (parent[across] == components) & (components < across)
+        parent[components[mutual]] = components[mutual]
+        while True:
+            grandparent = parent[parent]
+            if np.array_equal(grandparent, parent):
+                break
+            parent = grandparent
+        labels = parent[labels]
+        picked_edges.append(edge_index[np.unique(cheapest)])
+
+    edges = [edge_list[index] for index in np.concatenate(picked_edges).tolist()]
+    return edges, sum(weight for _, _, weight in edges)
+
+
+MST_ENGINES = {
+    "kruskal": kruskal,
+    "prim": prim,
+}
+if np is not None:
+    MST_ENGINES["boruvka"] = boruvka
+
+
+# Engine for "auto": Prim on dense graphs, Borůvka on large sparse ones
+# when NumPy is there, Kruskal otherwise. Measured on sparse 60k-400k edge
+# maps Borůvka takes about 0.7x Kruskal's time; both spend most of it
+# reading the edges out of the Graph.
+def choose_engine(graph):
+    vertex_count = graph.vertex_count()
+    edge_count = graph.edge_count()
+    possible = vertex_count * (vertex_count - 1) // 2
+    if possible and edge_count / possible >= DENSE_GRAPH:
+        return "prim"
+    if "boruvka" in MST_ENGINES and edge_count >= BORUVKA_MIN_EDGES:
+        return "boruvka"
+    return "kruskal"
+
+
+# Returns (engine, edges, total_weight)
+def minimum_spanning_tree(graph, engine="auto"):
+    if engine == "auto":
+        engine = choose_engine(graph)
+    if engine not in MST_ENGINES:
+        raise ValueError(f"Unknown MST engine: {engine}")
+    edges, total = MST_ENGINES[engine](graph)
+    return engine, edges, total
+
+
+# Dijkstra search from one source that can be paused and resumed: settled
+# vertices have their final distance, the heap keeps the frontier. Asking
+# for a farther vertex later continues from where the last query stopped.
+class ShortestPathTree:
+    def __init__(self, graph, source):
+        self.graph = graph
+        self.source = source
+        self.dist = {source: 0}
+        self.parent = {source: None}
+        self.settled = set()
+        self.heap = [(0, source)]
+
+    # Smallest distance on the frontier, inf when the search is exhausted
+    def peek(self):
+        heap = self.heap
+        while heap and heap[0][1] in self.settled:
+            heapq.heappop(heap)
+        return heap[0][0] if heap else math.inf
+
+    # Settle the next closest vertex and relax its edges, None when done
+    def step(self):
+        if self.peek() == math.inf:
+            return None
+        distance, vertex = heapq.heappop(self.heap)
+        self.settled.add(vertex)
+        for neighbor, weight in self.graph.neighbors(vertex):
+            candidate = distance + weight
+            if neighbor not in self.dist or candidate < self.dist[neighbor]:
+                self.dist[neighbor] = candidate
+                self.parent[neighbor] = vertex
+                heapq.heappush(self.heap, (candidate, neighbor))
+        return vertex
+
+    # Early exit: stop as soon as target is settled
+    def settle_until(self, target):
+        while target not in self.settled and self.step() is not None:
+            pass
+        return self.distance_to(target)
+
+    def distance_to(self, vertex):
+        return self.dist[vertex] if vertex in self.settled else math.inf
+
+    # Vertices from the source to vertex, None if it has not been reached
+    def path_to(self, vertex):
+        if vertex not in self.parent:
+            return None
+        path = []
+        while vertex is not None:
+            path.append(vertex)
+            vertex = self.parent[vertex]
+        path.reverse()
+        return path
+
+
+# Dijkstra from both ends at once, always advancing the side with the closer
+# frontier. Stops when the two frontiers together are at least the best
+# route seen. Returns (distance, path); (inf, None) if there is no route.
+def bidirectional_dijkstra(graph, source, target, forward=None, backward=None):
+    if source == target:
+        return 0, [source]
+    forward = forward or ShortestPathTree(graph, source)
+    backward = backward or ShortestPathTree(graph, target)
+    best = math.inf
+    meeting = None
+
+    while forward.peek() + backward.peek() < best:
+        tree, other = ((forward, backward) if forward.peek() <= backward.peek()
+                       else (backward, forward))
+        vertex = tree.step()
+        for neighbor, weight in graph.neighbors(vertex):
+            if neighbor in other.dist:
+                candidate = tree.dist[vertex] + weight + other.dist[neighbor]
+                if candidate < best:
+                    best = candidate
+                    meeting = (vertex, neighbor) if tree is forward else (neighbor, vertex)
+
+    if meeting is None:
+        return math.inf, None
+    return best, forward.path_to(meeting[0]) + backward.path_to(meeting[1])[::-1]
+
+
+# Shortest routes with the search trees kept per source. Any change to the
+# graph bumps graph.version, which drops every cached tree.
+class ShortestPathCache:
+    MAX_TREES = 64
+
+    def __init__(self, graph):
+        self.graph = graph
+        self.version = graph.version
+        self.trees = {}
+
+    def _tree(self, source):
+        if self.graph.version != self.version:
+            self.trees.clear()
+            self.version = self.graph.version
+        return self.trees.get(source)
+
+    def _store(self, tree):
+        if len(self.trees) >= self.MAX_TREES:
+            del self.trees[next(iter(self.trees))]
+        self.trees[tree.source] = tree
+
+    # Returns (distance, path), (inf, None) if target can't be reached
+    def route(self, source, target):
+        if source == target:
+            return 0, [source]
+
+        tree = self._tree(source)
+        if tree is not None:
+            return tree.settle_until(target), tree.path_to(target) if target in tree.settled else None
+
+        # Routes are undirected, a tree grown from target works backwards
+        tree = self._tree(target)
+        if tree is not None:
+            distance = tree.settle_until(source)
+            return distance, tree.path_to(source)[::-1] if source in tree.settled else None
+
+        # Cold query: search from both ends and keep both halves for later
+        forward = ShortestPathTree(self.graph, source)
+        backward = ShortestPathTree(self.graph, target)
+        result = bidirectional_dijkstra(self.graph, source, target, forward, backward)
+        self._store(forward)
+        self._store(backward)
+        return result
+
+
+# All-pairs distances are a V x V float64 NumPy matrix, rows and columns in
+# graph.vertices() order, inf where there is no route
+def _distance_matrix(graph):
+    if np is None:
+        raise RuntimeError("All-pairs distances need NumPy")
+    vertices = graph.vertices()
+    matrix = np.full((len(vertices), len(vertices)), np.inf)
+    np.fill_diagonal(matrix, 0)
+    return vertices, matrix
+
+
+# Floyd–Warshall where each step k relaxes the whole matrix at once through
+# row k and column k, so the V^3 work runs inside NumPy
+def floyd_warshall(graph):
+    vertices, matrix = _distance_matrix(graph)
+    ids = {vertex: i for i, vertex in enumerate(vertices)}
+    for from_v, to_v, weight in graph.edges():
+        i, j = ids[from_v], ids[to_v]
+        if i != j:
+            matrix[i, j] = matrix[j, i] = weight
+
+    for k in range(len(vertices)):
+        np.minimum(matrix, matrix[:, k, None] + matrix[None, k, :], out=matrix)
+    return vertices, matrix
+
+
+# Adjacency as CSR arrays over vertex ids: the neighbors of i are
+# targets[offsets[i]:offsets[i + 1]], with the same slice of weights
+def _csr(graph, ids):
+    offsets = array("i", [0])
+    targets = array("i")
+    weights = array("d")
+    for vertex in graph:
+        for neighbor, weight in graph.neighbors(vertex):
+            targets.append(ids[neighbor])
+            weights.append(weight)
+        offsets.append(len(targets))
+    return offsets, targets, weights
+
+
+_worker_csr = None
+
+
+def _init_worker(csr):
+    global _worker_csr
+    _worker_csr = csr
+
+
+def _attach(name):
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:  # track= is Python 3.13+
+        return shared_memory.SharedMemory(name=name)
+
+
+# Dijkstra from each of the given sources over the CSR graph, writing every
+# row straight into the shared matrix
+def _dijkstra_rows(name, vertex_count, sources):
+    offsets, targets, weights = _worker_csr
+    memory = _attach(name)
+    try:
+        matrix = memory.buf.cast("d")
+        for source in sources:
+            dist = [math.inf] * vertex_count
+            dist[source] = 0
+            heap = [(0, source)]
+            while heap:
+                distance, vertex = heapq.heappop(heap)
+                if distance > dist[vertex]:
+                    continue
+                for edge in range(offsets[vertex], offsets[vertex + 1]):
+                    candidate = distance + weights[edge]
+                    neighbor = targets[edge]
+                    if candidate < dist[neighbor]:
+                        dist[neighbor] = candidate
+                        heapq.heappush(heap, (candidate, neighbor))
+            matrix[source * vertex_count:(source + 1) * vertex_count] = array("d", dist)
+        matrix.release()
+    finally:
+        memory.close()
+
+
+# One Dijkstra per source, split over a process pool for large graphs. The
+# matrix is a SharedMemory block the workers fill row by row.
+def all_pairs_dijkstra(graph, workers=None):
+    if np is None:
+        raise RuntimeError("All-pairs distances need NumPy")
+    # Only the shared block and the returned copy are V x V here
+    vertices = graph.vertices()
+    vertex_count = len(vertices)
+    if vertex_count == 0:
+        return vertices, np.zeros((0, 0))
+    ids = {vertex: i for i, vertex in enumerate(vertices)}
+    csr = _csr(graph, ids)
+
+    workers = workers or os.cpu_count() or 1
+    if vertex_count < PARALLEL_MIN_VERTICES:
+        workers = 1
+    chunk = -(-vertex_count // (workers * 4))
+    batches = [range(lo, min(lo + chunk, vertex_count)) for lo in range(0, vertex_count, chunk)]
+
+    memory = shared_memory.SharedMemory(create=True, size=8 * vertex_count * vertex_count)
+    global _worker_csr
+    try:
+        if workers == 1:
+            _init_worker(csr)
+            for batch in batches:
+                _dijkstra_rows(memory.name, vertex_count, batch)
+        else:
+            with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(csr,)) as pool:
+                list(pool.map(_dijkstra_rows, [memory.name] * len(batches),
+                              [vertex_count] * len(batches), batches))
+        matrix = np.ndarray((vertex_count, vertex_count), dtype=np.float64, buffer=memory.buf).copy()
+        return vertices, matrix
+    finally:
+        # The single-worker path set the CSR in this process, don't pin it
+        _worker_csr = None
+        memory.close()
+        memory.unlink()
+
+
+ALL_PAIRS_ENGINES = {
+    "floyd": floyd_warshall,
+    "dijkstra": all_pairs_dijkstra,
+}
+
+
+# Floyd–Warshall for small or dense graphs, per-source Dijkstra otherwise
+def choose_all_pairs_engine(graph):
+    vertex_count = graph.vertex_count()
+    possible = vertex_count * (vertex_count - 1) // 2
+    if vertex_count <= FLOYD_MAX_VERTICES or (possible and graph.edge_count() / possible >= DENSE_GRAPH):
+        return "floyd"
+    return "dijkstra"
+
+
+# Returns (engine, vertices, matrix)
+def all_pairs_distances(graph, engine="auto"):
+    if engine == "auto":
+        engine = choose_all_pairs_engine(graph)
+    if engine not in ALL_PAIRS_ENGINES:
+        raise ValueError(f"Unknown all-pairs engine: {engine}")
+    vertices, matrix = ALL_PAIRS_ENGINES[engine](graph)
+    return engine, vertices, matrix
+
+
+# Save the matrix as .npy, float32 when that keeps every distance exact.
+# Vertex names go to a .txt file next to it, one per line in row order.
+# Returns (matrix path, names path); np.save adds .npy when missing, so the
+# path is normalised first to report the file actually written.
+def save_distance_matrix(path, vertices, matrix):
+    if not path.endswith(".npy"):
+        path += ".npy"
+    finite = matrix[np.isfinite(matrix)]
+    if finite.size == 0 or (np.all(finite == np.round(finite)) and finite.max() < 2 ** 24):
+        matrix = matrix.astype(np.float32)
+    np.save(path, matrix)
+    names_path = os.path.splitext(path)[0] + ".txt"
+    with open(names_path, "w", encoding="utf-8") as file:
+        file.writelines(f"{vertex}\n" for vertex in vertices)
+    return path, names_path
+
+
+# Counters reported by import_edge_list
+class ImportStats:
+    # Line numbers kept for the error report
+    MAX_INVALID_LINES = 10
+
+    def __init__(self):
+        self.vertices = 0
+        self.edges = 0
+        self.duplicates = 0
+        self.invalid = 0
+        self.invalid_lines = []
+
+    def reject(self, line_number):
+        self.invalid += 1
+        if len(self.invalid_lines) < self.MAX_INVALID_LINES:
+            self.invalid_lines.append(line_number)
+
+    def __repr__(self):
+        return (f"ImportStats({self.vertices} vertices, {self.edges} edges, "
+                f"{self.duplicates} duplicates, {self.invalid} invalid)")
+
+
+# Rows of a "from,to,weight" CSV or TSV file, read lazily. Yields
+# (from, to, weight) with weight None for a lone island row ("from").
+# Rows that don't parse are reported to stats and skipped. A first line
+# with a non-numeric weight is skipped uncounted as a header, unless one of
+# its islands is already in islands (then it is a bad route).
+def read_edge_list(path, stats, islands=()):
+    with open(path, newline="", encoding="utf-8") as file:
+        first_line = file.readline()
+        delimiter = "\t" if "\t" in first_line else ","
+        file.seek(0)
+
+        for line_number, row in enumerate(csv.reader(file, delimiter=delimiter), 1):
+            row = [field.strip() for field in row]
+            if not any(row):
+                continue
+            if len(row) == 1:
+                yield row[0], None, None
+                continue
+            if len(row) != 3 or not row[0] or not row[1] or row[0] == row[1]:
+                stats.reject(line_number)
+                continue
+            try:
+                weight = int(row[2])
+            except ValueError:
+                if line_number != 1 or row[0] in islands or row[1] in islands:
+                    stats.reject(line_number)
+                continue
+            if weight <= 0:
+                stats.reject(line_number)
+                continue
+            yield row[0], row[1], weight
+
+
+# Add the islands and routes of an edge-list file to graph, batch_size rows
+# at a time so only one batch is in memory besides the graph. Routes already
+# in the graph or repeated in the file are counted as duplicates.
+def import_edge_list(graph, path, batch_size=10_000):
+    stats = ImportStats()
+    rows = read_edge_list(path, stats, graph)
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            return stats
+        for from_v, to_v, weight in batch:
+            stats.vertices += graph.add_vertex(from_v)
+            if to_v is None:
+                continue
+            stats.vertices += graph.add_vertex(to_v)
+            if graph.add_edge(from_v, to_v, weight):
+                stats.edges += 1
+            else:
+                stats.duplicates += 1
@@ -1,7 +1,10 @@
 from MainWindow import *
 from PyQt6.QtWidgets import QApplication
+import multiprocessing
 
 if __name__ == "__main__":
+    # Needed by the MST process pool in the PyInstaller build
+    multiprocessing.freeze_support()
     app = QApplication(sys.argv)
     window = MainWindow()
     window.show()
@@ -0,0 +1,221 @@
+import atexit
+import os
+import pickle
+import struct
+import threading
+import zlib
+
+import estructuras
+from estructuras import Stack, Queue, Tree, CircularList, Graph
+
+DATA_DIR = "datos"
+
+
+# Operations that are not a plain method call on the structure
+def _tree_delete(tree, value):
+    tree.root = tree.delNode(tree.root, value)
+
+
+OPERATIONS = {
+    "delete": _tree_delete,
+}
+
+
+# Plain data for a snapshot, independent of the node objects
+def dump_state(structure):
+    if isinstance(structure, Stack):
+        return list(structure.stack)
+    if isinstance(structure, Queue):
+        return (structure.capacity, structure.policy, list(structure.queue))
+    if isinstance(structure, Tree):
+        # Pre-order values and child flags, reloaded into the same shape in O(n)
+        return structure.to_preorder()
+    if isinstance(structure, CircularList):
+        return structure.traverse()
+    if isinstance(structure, Graph):
+        return (structure.vertices(), list(structure.edges()))
+    raise TypeError(f"Cannot persist {type(structure).__name__}")
+
+
+def load_state(class_name, state):
+    structure_class = getattr(estructuras, class_name)
+    if issubclass(structure_class, Queue):
+        capacity, policy, items = state
+        structure = structure_class(capacity, policy)
+        structure.queue.extend(items)
+        return structure
+
+    if issubclass(structure_class, Tree):
+        if isinstance(state, list):
+            # Snapshot from before the shape was saved: values only
+            return structure_class.from_iterable(state)
+        return structure_class.from_preorder(*state)
+
+    structure = structure_class()
+    if issubclass(structure_class, Stack):
+        structure.stack = list(state)
+    elif issubclass(structure_class, CircularList):
+        for value in state:
+            structure.push(value)
+    elif issubclass(structure_class, Graph):
+        vertices, edges = state
+        for vertex in vertices:
+            structure.add_vertex(vertex)
+        for from_v, to_v, weight in edges:
+            structure.add_edge(from_v, to_v, weight)
+    return structure
+
+
+# Append-only file of (seq, operation, args) records. Each record is
+# length + crc32 + pickle, so a half-written tail is detected and dropped.
+# Records are flushed to the OS right away and fsync'd in batches: after
+# sync_every records, or by a timer sync_interval seconds after the first
+# unsynced one, so an edit followed by idle time still reaches the disk.
+class Journal:
+    RECORD = struct.Struct("<II")
+
+    def __init__(self, path, sync_every=64, sync_interval=1.0):
+        self.path = path
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        self.pending = 0
+        self.timer = None
+        # The timer thread syncs while the GUI thread may be appending
+        self.lock = threading.Lock()
+        self.file = open(path, "ab")
+
+    def append(self, seq, operation, args):
+        payload = pickle.dumps((seq, operation, args), pickle.HIGHEST_PROTOCOL)
+        with self.lock:
+            self.file.write(self.RECORD.pack(len(payload), zlib.crc32(payload)) + payload)
+            self.file.flush()
+            self.pending += 1
+            if self.pending >= self.sync_every:
+                self._sync()
+            elif self.timer is None:
+                self.timer = threading.Timer(self.sync_interval, self.sync)
+                self.timer.daemon = True
+                self.timer.start()
+
+    def _sync(self):
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        if self.pending and not self.file.closed:
+            os.fsync(self.file.fileno())
+            self.pending = 0
+
+    def sync(self):
+        with self.lock:
+            self._sync()
+
+    # Start over with an empty file, used right after a snapshot
+    def truncate(self):
+        with self.lock:
+            self.file.truncate(0)
+            # Counts as a change, so _sync fsyncs the emptied file
+            self.pending += 1
+            self._sync()
+
+    def close(self):
+        with self.lock:
+            if not self.file.closed:
+                self._sync()
+                self.file.close()
+
+    # Yield the valid records of a journal file, cutting off a torn tail
+    @classmethod
+    def read(cls, path):
+        if not os.path.exists(path):
+            return
+        with open(path, "rb") as file:
+            data = file.read()
+        offset = 0
+        while offset + cls.RECORD.size <= len(data):
+            length, checksum = cls.RECORD.unpack_from(data, offset)
+            start = offset + cls.RECORD.size
+            payload = data[start:start + length]
+            if len(payload) < length or zlib.crc32(payload) != checksum:
+                break
+            yield pickle.loads(payload)
+            offset = start + length
+        if offset < len(data):
+            with open(path, "r+b") as file:
+                file.truncate(offset)
+
+
+# A structure whose changes are logged to a journal, with a snapshot
+# every snapshot_every operations. Opening the store recovers the structure
+# from the last snapshot plus the journal records written after it.
+class PersistentStore:
+    def __init__(self, name, factory, directory=DATA_DIR, snapshot_every=1000,
+                 sync_every=64, sync_interval=1.0):
+        os.makedirs(directory, exist_ok=True)
+        self.snapshot_path = os.path.join(directory, f"{name}.snapshot")
+        self.journal_path = os.path.join(directory, f"{name}.journal")
+        self.snapshot_every = snapshot_every
+        self.seq = 0
+        self.since_snapshot = 0
+        self.structure = self._recover(factory)
+        self.journal = Journal(self.journal_path, sync_every, sync_interval)
+        atexit.register(self.close)
+
+    def _recover(self, factory):
+        structure = None
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, "rb") as file:
+                self.seq, class_name, state = pickle.load(file)
+            structure = load_state(class_name, state)
+        if structure is None:
+            structure = factory()
+
+        # Only the tail after the snapshot is replayed. Records are written
+        # after the operation succeeded, but a failing one is skipped rather
+        # than blocking every later start.
+        for seq, operation, args in Journal.read(self.journal_path):
+            if seq > self.seq:
+                try:
+                    self._run(structure, operation, args)
+                except Exception:
+                    pass
+                self.seq = seq
+                self.since_snapshot += 1
+        return structure
+
+    def _run(self, structure, operation, args):
+        if operation in OPERATIONS:
+            return OPERATIONS[operation](structure, *args)
+        return getattr(structure, operation)(*args)
+
+    # Apply the operation, then log it and return its result. An operation
+    # that raises is not logged, so replay never hits it again.
+    def apply(self, operation, *args):
+        result = self._run(self.structure, operation, args)
+        self.seq += 1
+        self.journal.append(self.seq, operation, args)
+        self.since_snapshot += 1
+        if self.since_snapshot >= self.snapshot_every:
+            self.snapshot()
+        return result
+
+    # Write the whole structure, then empty the journal. The snapshot is
+    # written to a temporary file and renamed so a crash leaves the old one.
+    def snapshot(self):
+        temp_path = self.snapshot_path + ".tmp"
+        with open(temp_path, "wb") as file:
+            pickle.dump((self.seq, type(self.structure).__name__, dump_state(self.structure)),
+                        file, pickle.HIGHEST_PROTOCOL)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, self.snapshot_path)
+        self.journal.truncate()
+        self.since_snapshot = 0
+
+    # Replace the structure (clear, rebuild, bulk load) and snapshot it
+    def reset(self, structure):
+        self.structure = structure
+        self.snapshot()
+        return structure
+
+    def close(self):
+        self.journal.close()
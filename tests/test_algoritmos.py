@@ -0,0 +1,107 @@
+import bisect
+import random
+
+import pytest
+
+import algoritmos
+from algoritmos import (SORT_ENGINES, sort, binary_search, search_many,
+                        sorted_insert, sorted_remove, halving_gaps, ciura_gaps, tokuda_gaps)
+from estructuras import BlockList, MappedIntArray, IntArray, np
+
+
+def random_values(seed, size=300):
+    rng = random.Random(seed)
+    return [rng.randint(-1000, 1000) for _ in range(size)]
+
+
+@pytest.mark.parametrize("engine", sorted(SORT_ENGINES))
+@pytest.mark.parametrize("size", [0, 1, 2, 17, 300])
+def test_sort_engines_match_sorted(engine, size):
+    values = random_values(size, size)
+    array = list(values)
+    stats = sort(array, engine)
+    assert array == sorted(values)
+    assert stats.engine == engine
+    assert stats.seconds >= 0
+
+
+@pytest.mark.parametrize("engine", sorted(SORT_ENGINES))
+def test_sort_engines_on_duplicates_and_sorted_input(engine):
+    for values in ([5] * 50, list(range(100)), list(range(100, 0, -1))):
+        array = list(values)
+        sort(array, engine)
+        assert array == sorted(values)
+
+
+@pytest.mark.parametrize("engine", sorted(SORT_ENGINES))
+def test_sort_blocklist(engine):
+    values = random_values(7, 2500)
+    array = BlockList(values)
+    sort(array, engine)
+    assert array.tolist() == sorted(values)
+
+
+@pytest.mark.parametrize("engine", sorted(SORT_ENGINES))
+def test_sort_mapped_array(engine, tmp_path):
+    values = random_values(8)
+    array = MappedIntArray(str(tmp_path / "cuentas.bin"), values)
+    try:
+        sort(array, engine)
+        assert array.tolist() == sorted(values)
+    finally:
+        array.close()
+
+
+@pytest.mark.skipif(np is None, reason="IntArray needs NumPy")
+@pytest.mark.parametrize("engine", sorted(SORT_ENGINES))
+def test_sort_intarray(engine):
+    values = random_values(9)
+    array = IntArray(values)
+    sort(array, engine)
+    assert array.tolist() == sorted(values)
+
+
+def test_unknown_engine():
+    with pytest.raises(ValueError):
+        sort([3, 1, 2], "bogo")
+
+
+def test_gap_sequences_end_in_one():
+    for gaps in (halving_gaps, ciura_gaps, tokuda_gaps):
+        for n in (2, 10, 1000, 100000):
+            sequence = gaps(n)
+            assert sequence[-1] == 1
+            assert sequence == sorted(sequence, reverse=True)
+
+
+def test_searches_match_bisect():
+    values = sorted(random_values(3))
+    for value in range(-1100, 1100, 7):
+        index = binary_search(values, value)
+        if value in values:
+            assert values[index] == value
+        else:
+            assert index == -1
+
+    queries = random_values(4, 100)
+    for value, index in search_many(values, queries):
+        assert index == (bisect.bisect_left(values, value) if value in values else -1)
+
+
+def test_sorted_insert_and_remove():
+    array = []
+    reference = []
+    for value in random_values(5, 200):
+        sorted_insert(array, value)
+        bisect.insort(reference, value)
+    assert array == reference
+    for value in random_values(6, 200):
+        expected = value in reference
+        assert (sorted_remove(array, value) != -1) == expected
+        if expected:
+            reference.remove(value)
+    assert array == reference
+
+
+def test_numpy_engine_registered_only_with_numpy():
+    assert ("numpy" in SORT_ENGINES) == (algoritmos.np is not None)
@@ -0,0 +1,62 @@
+import os
+import random
+
+import pytest
+
+QtWidgets = pytest.importorskip("PyQt6.QtWidgets")
+
+from estructuras import Tree, CompactTree
+from BinaryTreePage import BinaryTreeCanvas
+
+
+@pytest.fixture(scope="module")
+def canvas():
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    yield BinaryTreeCanvas()
+    app.processEvents()
+
+
+def random_tree(seed, tree_class=Tree):
+    rng = random.Random(seed)
+    tree = tree_class()
+    for _ in range(rng.randint(1, 120)):
+        tree.insert(rng.randrange(1000))
+    return tree
+
+
+# Tidy layout: in-order left to right on every level, NODE_SPACING apart,
+# and each parent exactly between its two children
+@pytest.mark.parametrize("tree_class", [Tree, CompactTree])
+def test_tidy_layout_keeps_order_and_spacing(canvas, tree_class):
+    for seed in range(30):
+        records = random_tree(seed, tree_class).layout()
+        canvas.set_tree_data(records)
+        positions = canvas.positions
+
+        levels = {}
+        children = {}
+        for i, (_, parent, depth, order) in enumerate(records):
+            assert positions[i][1] == canvas.MARGIN + depth * canvas.LEVEL_SPACING
+            levels.setdefault(depth, []).append((order, positions[i][0]))
+            if parent is not None:
+                children.setdefault(parent, []).append(i)
+
+        for row in levels.values():
+            row.sort()
+            for (_, x1), (_, x2) in zip(row, row[1:]):
+                assert x2 - x1 >= canvas.NODE_SPACING - 1
+
+        for parent, kids in children.items():
+            if len(kids) == 2:
+                middle = (positions[kids[0]][0] + positions[kids[1]][0]) / 2
+                assert abs(positions[parent][0] - middle) <= 1
+
+
+def test_degenerate_tree_layout_stays_in_order(canvas):
+    tree = Tree()
+    for value in range(1000):
+        tree.insert(value)
+    canvas.set_tree_data(tree.layout())
+    xs = [canvas.positions[i][0] for i in range(1000)]
+    assert xs == sorted(xs)
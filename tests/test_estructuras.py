@@ -0,0 +1,676 @@
+import math
+import random
+import threading
+
+import pytest
+
+from estructuras import (Queue, Tree, AVLTree, CompactTree, CircularList,
+                         IndexedCircularList, IntArray, BlockList, MappedIntArray,
+                         Graph, MinimumSpanningForest, UnionFind, np)
+
+
+def test_queue_is_fifo_without_capacity():
+    queue = Queue()
+    for i in range(1000):
+        queue.enqueue(i)
+    assert queue.size() == 1000 and queue.peek() == 0
+    assert queue.toList(limit=2).endswith("(998 más)")
+    assert [queue.dequeue() for _ in range(1000)] == list(range(1000))
+    assert queue.isEmpty() and queue.dequeue() == "Queue is empty"
+
+
+def test_queue_full_policies():
+    reject = Queue(3, Queue.REJECT)
+    overwrite = Queue(3, Queue.OVERWRITE)
+    for i in range(5):
+        reject.enqueue(i)
+        overwrite.enqueue(i)
+    assert list(reject.queue) == [0, 1, 2] and reject.isFull()
+    assert reject.enqueue(9) == "Queue is full"
+    assert list(overwrite.queue) == [2, 3, 4]
+    with pytest.raises(ValueError):
+        Queue(0)
+    with pytest.raises(ValueError):
+        Queue(3, "drop")
+
+
+def test_blocking_queue_waits_for_room():
+    queue = Queue(1, Queue.BLOCK)
+    queue.enqueue("a")
+    assert queue.enqueue("b", timeout=0.01) == "Queue is full"
+    consumer = threading.Timer(0.05, queue.dequeue)
+    consumer.start()
+    assert queue.enqueue("c", timeout=2) is None
+    consumer.join()
+    assert list(queue.queue) == ["c"]
+
+
+def test_blocking_queue_gives_up_after_the_default_wait(monkeypatch):
+    monkeypatch.setattr(Queue, "BLOCK_TIMEOUT", 0.01)
+    queue = Queue(1, Queue.BLOCK)
+    queue.enqueue("a")
+    assert queue.enqueue("b") == "Queue is full"
+    assert list(queue.queue) == ["a"]
+
+
+# In-order values and height of a subtree, checking the AVL balance on the way
+def walk_balanced(node):
+    if node is None:
+        return [], -1
+    left, left_height = walk_balanced(node.left)
+    right, right_height = walk_balanced(node.right)
+    assert abs(left_height - right_height) <= 1
+    return left + [node.data] + right, 1 + max(left_height, right_height)
+
+
+def test_avl_tree_stays_balanced():
+    rng = random.Random(2)
+    tree = AVLTree()
+    values = []
+    for _ in range(3000):
+        value = rng.randrange(500)
+        if rng.random() < 0.7:
+            tree.insert(value)
+            values.append(value)
+        elif value in values:
+            tree.root = tree.delNode(tree.root, value)
+            values.remove(value)
+    inorder, height = walk_balanced(tree.root)
+    assert inorder == sorted(values)
+    assert height == tree.getHeight(tree.root, 0)
+    assert height <= 1.45 * math.log2(len(values) + 2)
+
+
+def test_avl_tree_handles_sorted_input():
+    tree = AVLTree()
+    for value in range(1024):
+        tree.insert(value)
+    inorder, height = walk_balanced(tree.root)
+    assert inorder == list(range(1024))
+    assert height <= 11
+    assert tree.search(tree.root, 777).data == 777
+    assert tree.search(tree.root, 5000) is None
+
+
+# Recursive reference traversals over the node links
+def preorder(node):
+    return [] if node is None else [node.data] + preorder(node.left) + preorder(node.right)
+
+
+def inorder(node):
+    return [] if node is None else inorder(node.left) + [node.data] + inorder(node.right)
+
+
+def postorder(node):
+    return [] if node is None else postorder(node.left) + postorder(node.right) + [node.data]
+
+
+def levelorder(node):
+    level = [node] if node is not None else []
+    values = []
+    while level:
+        values += [current.data for current in level]
+        level = [child for current in level for child in (current.left, current.right)
+                 if child is not None]
+    return values
+
+
+def height(node):
+    return -1 if node is None else 1 + max(height(node.left), height(node.right))
+
+
+def random_tree(seed, tree_class=Tree, size=300):
+    rng = random.Random(seed)
+    tree = tree_class()
+    for _ in range(size):
+        tree.insert(rng.randrange(100))
+    for _ in range(size // 4):
+        tree.root = tree.delNode(tree.root, rng.randrange(100))
+    return tree
+
+
+@pytest.mark.parametrize("tree_class", [Tree, AVLTree])
+def test_iterative_traversals_match_recursive(tree_class):
+    for seed in range(10):
+        tree = random_tree(seed, tree_class)
+        assert list(tree.iter_preorder()) == preorder(tree.root)
+        assert list(tree.iter_inorder()) == inorder(tree.root)
+        assert list(tree.iter_postorder()) == postorder(tree.root)
+        assert list(tree.iter_levelorder()) == levelorder(tree.root)
+        assert tree.preOrderTraversal(tree.root) == preorder(tree.root)
+        assert tree.postOrderTraversal(tree.root.left) == postorder(tree.root.left)
+        assert list(tree.iter_inorder(tree.root.right)) == inorder(tree.root.right)
+        assert tree.getHeight(tree.root, 0) == height(tree.root)
+        for value in range(0, 100, 9):
+            found = tree.search(tree.root, value)
+            assert (found is not None) == (value in inorder(tree.root))
+
+
+def test_degenerate_tree_is_walked_without_recursion():
+    tree = Tree()
+    for value in range(2000):
+        tree.insert(value)
+    assert list(tree.iter_inorder()) == list(range(2000))
+    assert next(tree.iter_postorder()) == 1999
+    assert tree.getHeight(tree.root, 0) == 1999
+    assert tree.search(tree.root, 1999).data == 1999
+    tree.root = tree.delNode(tree.root, 1999)
+    assert tree.search(tree.root, 1999) is None
+    assert tree.inOrderTraversal(None) == []
+
+
+@pytest.mark.parametrize("tree_class", [Tree, AVLTree])
+def test_layout_records(tree_class):
+    assert tree_class().layout() == []
+    for seed in range(10):
+        tree = random_tree(seed, tree_class)
+        records = tree.layout()
+        assert [value for value, _, _, _ in records] == preorder(tree.root)
+        by_order = sorted(records, key=lambda record: record[3])
+        assert [value for value, _, _, _ in by_order] == inorder(tree.root)
+        for index, (_, parent, depth, _) in enumerate(records):
+            if parent is None:
+                assert index == 0 and depth == 0
+            else:
+                assert parent < index and records[parent][2] == depth - 1
+        assert max(depth for _, _, depth, _ in records) == height(tree.root)
+
+
+@pytest.mark.parametrize("tree_class", [Tree, AVLTree])
+def test_order_statistics_match_sorted_list(tree_class):
+    rng = random.Random(4)
+    tree = tree_class()
+    values = []
+    for _ in range(500):
+        value = rng.randrange(200)
+        if rng.random() < 0.7:
+            tree.insert(value)
+            values.append(value)
+        elif value in values:
+            tree.root = tree.delNode(tree.root, value)
+            values.remove(value)
+    values.sort()
+    assert tree.size() == len(values)
+    assert tree.getHeight(tree.root, 0) == height(tree.root)
+    for k in range(len(values)):
+        assert tree.select(k) == values[k]
+        assert tree.kth_smallest(k + 1) == values[k]
+    assert tree.select(len(values)) is None and tree.select(-1) is None
+    for x in range(-1, 202, 7):
+        assert tree.rank(x) == sum(value < x for value in values)
+    middle = len(values) // 2
+    expected = values[middle] if len(values) % 2 else (values[middle - 1] + values[middle]) / 2
+    assert tree.median() == expected
+    assert Tree().median() is None and Tree().size() == 0
+
+
+@pytest.mark.parametrize("tree_class", [Tree, AVLTree])
+def test_bulk_build_is_balanced(tree_class):
+    rng = random.Random(6)
+    values = [rng.randrange(1000) for _ in range(1000)]
+    tree = tree_class.from_iterable(values)
+    assert list(tree.iter_inorder()) == sorted(values)
+    assert tree.size() == 1000 and tree.getHeight(tree.root, 0) == 9
+
+    batch = [rng.randrange(1000) for _ in range(500)]
+    tree.bulk_insert(batch)
+    assert list(tree.iter_inorder()) == sorted(values + batch)
+    assert tree.size() == 1500 and tree.getHeight(tree.root, 0) == 10
+    tree.insert(-1)
+    tree.root = tree.delNode(tree.root, values[0])
+    assert tree.size() == 1500 and tree.select(0) == -1
+
+    assert tree_class.from_iterable(range(7), presorted=True).levelOrder(None) == []
+    small = tree_class.from_iterable(range(7), presorted=True)
+    assert small.levelOrder(small.root) == [3, 1, 5, 0, 2, 4, 6]
+
+
+@pytest.mark.parametrize("tree_class", [Tree, AVLTree])
+def test_range_matches_filter(tree_class):
+    tree = random_tree(7, tree_class, 400)
+    values = inorder(tree.root)
+    for lo in range(-5, 110, 6):
+        for width in (0, 3, 20):
+            hi = lo + width
+            assert list(tree.range(lo, hi)) == [v for v in values if lo <= v <= hi]
+            assert list(tree.range(lo, hi, inclusive=False)) == [v for v in values if lo < v < hi]
+    assert list(tree.range(5, 1)) == []
+
+
+def test_range_is_lazy():
+    tree = Tree()
+    for value in range(2000):
+        tree.insert(value)
+    matches = tree.range(10, 1500)
+    assert next(matches) == 10 and next(matches) == 11
+
+
+# The same inserts and deletes on both trees, CompactTree must keep the same shape
+def random_tree_pair(seed, operations=400):
+    rng = random.Random(seed)
+    tree, compact = Tree(), CompactTree()
+    for _ in range(operations):
+        value = rng.randrange(150)
+        if rng.random() < 0.7:
+            tree.insert(value)
+            compact.insert(value)
+        else:
+            tree.root = tree.delNode(tree.root, value)
+            compact.root = compact.delNode(compact.root, value)
+    return tree, compact
+
+
+def test_compact_tree_matches_tree():
+    for seed in range(20):
+        tree, compact = random_tree_pair(seed)
+        assert list(compact.iter_preorder()) == list(tree.iter_preorder())
+        assert list(compact.iter_inorder()) == list(tree.iter_inorder())
+        assert list(compact.iter_postorder()) == list(tree.iter_postorder())
+        assert list(compact.iter_levelorder()) == list(tree.iter_levelorder())
+        assert compact.levelOrder(compact.root) == tree.levelOrder(tree.root)
+        assert compact.layout() == tree.layout()
+        assert compact.getHeight(compact.root, 0) == tree.getHeight(tree.root, 0)
+        assert compact.size() == tree.size()
+        for x in range(-1, 152, 5):
+            assert compact.rank(x) == tree.rank(x)
+            assert compact.select(x) == tree.select(x)
+            assert (compact.search(compact.root, x) is None) == (tree.search(tree.root, x) is None)
+            assert list(compact.range(x, x + 20)) == list(tree.range(x, x + 20))
+
+
+def test_compact_tree_bulk_insert_and_free_list():
+    tree = CompactTree.from_iterable(range(0, 100, 2))
+    tree.bulk_insert([5, 1, 99])
+    assert list(tree.iter_inorder()) == sorted([*range(0, 100, 2), 1, 5, 99])
+    assert tree.getHeight(tree.root, 0) == 5
+
+    slots = len(tree.keys)
+    for value in range(0, 20, 2):
+        tree.root = tree.delNode(tree.root, value)
+        tree.insert(value + 1000)
+    assert len(tree.keys) == slots
+
+    with pytest.raises(OverflowError):
+        tree.bulk_insert([2 ** 63])
+    assert tree.size() == 53
+
+
+@pytest.mark.parametrize("tree_class", [Tree, AVLTree, CompactTree])
+def test_tree_queries_match_sorted_list(tree_class):
+    rng = random.Random(4)
+    tree = tree_class()
+    values = []
+    for _ in range(500):
+        value = rng.randrange(200)
+        if rng.random() < 0.7:
+            tree.insert(value)
+            values.append(value)
+        elif value in values:
+            tree.root = tree.delNode(tree.root, value)
+            values.remove(value)
+    values.sort()
+    assert list(tree.iter_inorder()) == values
+    assert tree.size() == len(values)
+    for k in range(len(values)):
+        assert tree.select(k) == values[k]
+    for x in range(-1, 202, 7):
+        assert tree.rank(x) == sum(value < x for value in values)
+        assert (tree.search(tree.root, x) is not None) == (x in values)
+        assert list(tree.range(x, x + 30)) == [v for v in values if x <= v <= x + 30]
+        assert list(tree.range(x, x + 30, inclusive=False)) == [v for v in values if x < v < x + 30]
+
+
+@pytest.mark.parametrize("tree_class", [Tree, AVLTree, CompactTree])
+def test_from_preorder_rebuilds_the_same_shape(tree_class):
+    for seed in range(10):
+        tree = random_tree(seed, tree_class)
+        rebuilt = tree_class.from_preorder(*tree.to_preorder())
+        assert rebuilt.layout() == tree.layout()
+        assert rebuilt.size() == tree.size()
+        assert rebuilt.getHeight(rebuilt.root, 0) == tree.getHeight(tree.root, 0)
+        rebuilt.insert(50)
+        tree.insert(50)
+        assert rebuilt.layout() == tree.layout()
+    assert tree_class.from_preorder([], b"").root is None
+
+
+@pytest.mark.parametrize("list_class", [CircularList, IndexedCircularList])
+def test_circular_list_matches_list(list_class):
+    rng = random.Random(9)
+    playlist = list_class()
+    expected = []
+    for step in range(1500):
+        operation = rng.random()
+        if operation < 0.3:
+            playlist.push(step)
+            expected.append(step)
+        elif operation < 0.5:
+            position = rng.randint(0, len(expected))
+            playlist.insert_at(position, step)
+            expected.insert(position, step)
+        elif operation < 0.6 and expected:
+            assert playlist.pop() == expected.pop(0)
+        elif operation < 0.8 and expected:
+            position = rng.randrange(len(expected))
+            assert playlist.delete_at(position) == expected.pop(position)
+        else:
+            playlist.rotate()
+            expected = expected[1:] + expected[:1]
+        assert playlist.get_size() == len(expected)
+        if expected:
+            assert playlist.tail.next is playlist.head
+            assert playlist.tail.data == expected[-1]
+        if step % 100 == 0:
+            assert playlist.traverse() == expected
+            for position in range(0, len(expected), 5):
+                assert playlist.get_at(position) == expected[position]
+    assert playlist.traverse() == expected
+    assert playlist.insert_at(len(expected) + 1, "x") == "Invalid position"
+    assert playlist.delete_at(-1) == "Invalid position"
+
+
+def test_circular_list_concat():
+    playlist, other = CircularList(), CircularList()
+    for title in "abc":
+        playlist.push(title)
+    for title in "xy":
+        other.push(title)
+    playlist.concat(other)
+    assert playlist.traverse() == list("abcxy") and playlist.get_size() == 5
+    assert playlist.tail.data == "y" and playlist.tail.next is playlist.head
+    assert other.is_empty() and other.get_size() == 0
+
+    playlist.concat(CircularList())
+    empty = CircularList()
+    empty.concat(playlist)
+    assert empty.traverse() == list("abcxy") and playlist.is_empty()
+
+
+@pytest.mark.parametrize("list_class", [CircularList, IndexedCircularList])
+def test_title_index_follows_every_change(list_class):
+    playlist = list_class()
+    for title in ["a", "b", "a", "c"]:
+        playlist.push(title)
+    assert playlist.contains("a") and not playlist.contains("z")
+    assert playlist.count("a") == 2 and playlist.count("z") == 0
+    assert playlist.positions_of("a") == [0, 2] and playlist.positions_of("z") == []
+
+    playlist.delete_at(2)
+    assert playlist.positions_of("a") == [0]
+    playlist.pop()
+    assert not playlist.contains("a")
+    playlist.insert_at(1, "a")
+    playlist.rotate()
+    assert playlist.traverse() == ["a", "c", "b"]
+    assert playlist.positions_of("a") == [0]
+
+    other = list_class()
+    other.push("a")
+    other.push("d")
+    playlist.concat(other)
+    assert playlist.count("a") == 2 and playlist.positions_of("a") == [0, 3]
+    assert playlist.contains("d") and not other.contains("d")
+
+
+# Every upper-level link must skip exactly the positions its width says
+def check_skip_list(playlist, expected):
+    assert playlist.traverse() == expected
+    assert playlist.get_size() == len(expected)
+    nodes = []
+    node = playlist.head
+    for _ in range(playlist.size):
+        nodes.append(node)
+        node = node.next
+    assert node is playlist.head and (not nodes or nodes[-1] is playlist.tail)
+    position = {node: i for i, node in enumerate(nodes)}
+    position[playlist.header] = -1
+    for level in range(1, playlist.MAX_LEVEL):
+        node = playlist.header
+        while node.forward[level - 1] is not None:
+            assert level < playlist.level
+            following = node.forward[level - 1]
+            assert node.width[level - 1] == position[following] - position[node]
+            node = following
+
+
+def test_indexed_circular_list_matches_list():
+    rng = random.Random(5)
+    playlist = IndexedCircularList()
+    expected = []
+    for step in range(2000):
+        operation = rng.random()
+        if operation < 0.4:
+            position = rng.randint(0, len(expected))
+            playlist.insert_at(position, step)
+            expected.insert(position, step)
+        elif operation < 0.6 and expected:
+            position = rng.randrange(len(expected))
+            assert playlist.delete_at(position) == expected.pop(position)
+        elif operation < 0.8:
+            playlist.rotate()
+            expected = expected[1:] + expected[:1]
+        else:
+            other = IndexedCircularList()
+            extra = [f"t{step}_{i}" for i in range(rng.randint(0, 8))]
+            for title in extra:
+                other.push(title)
+            playlist.concat(other)
+            expected += extra
+            assert other.is_empty() and other.traverse() == []
+            other.push("again")
+            assert other.traverse() == ["again"]
+        if step % 50 == 0:
+            check_skip_list(playlist, expected)
+            for position in range(0, len(expected), 7):
+                assert playlist.get_at(position) == expected[position]
+    check_skip_list(playlist, expected)
+
+
+def test_indexed_rotate_keeps_nodes_and_index():
+    playlist = IndexedCircularList()
+    first = playlist.push("a")
+    playlist.push("b")
+    playlist.push("a")
+    playlist.rotate()
+    assert playlist.traverse() == ["b", "a", "a"]
+    assert playlist.tail is first
+    assert playlist.positions_of("a") == [1, 2]
+
+    plain = CircularList()
+    plain.push("c")
+    playlist.concat(plain)
+    assert playlist.traverse() == ["b", "a", "a", "c"] and plain.is_empty()
+    assert playlist.count("a") == 2 and playlist.contains("c")
+
+
+@pytest.mark.skipif(np is None, reason="IntArray needs NumPy")
+def test_int_array_matches_list():
+    rng = random.Random(13)
+    array = IntArray(range(5))
+    expected = list(range(5))
+    for step in range(300):
+        operation = rng.random()
+        if operation < 0.3:
+            array.append(step)
+            expected.append(step)
+        elif operation < 0.4:
+            batch = [rng.randint(-50, 50) for _ in range(rng.randint(0, 40))]
+            array.extend(batch)
+            expected.extend(batch)
+        elif operation < 0.6:
+            position = rng.randint(-len(expected) - 2, len(expected) + 2)
+            batch = [rng.randint(-50, 50) for _ in range(rng.randint(1, 5))]
+            array.insert_many(position, batch)
+            # Where list.insert would put a single value
+            start = max(0, min(position + len(expected) if position < 0 else position, len(expected)))
+            expected[start:start] = batch
+        elif operation < 0.8 and expected:
+            position = rng.randrange(-len(expected), len(expected))
+            assert array.pop(position) == expected.pop(position)
+        elif expected:
+            position = rng.randrange(len(expected))
+            array[position] = step
+            expected[position] = step
+    assert array.tolist() == expected and len(array) == len(expected)
+    assert list(array) == expected and array[-1] == expected[-1]
+    assert array[2:9].tolist() == expected[2:9]
+    with pytest.raises(IndexError):
+        array[len(expected)]
+
+    array.insert(-1, 99)
+    expected.insert(-1, 99)
+    assert array.tolist() == expected
+
+    array.sort()
+    expected.sort()
+    assert array.tolist() == expected
+    assert array.searchsorted([expected[3], 10 ** 6]).tolist() == [expected.index(expected[3]), len(expected)]
+
+
+def test_block_list_matches_list(monkeypatch):
+    monkeypatch.setattr(BlockList, "BLOCK_SIZE", 8)
+    rng = random.Random(16)
+    array = BlockList(range(50))
+    expected = list(range(50))
+    for step in range(1500):
+        operation = rng.random()
+        if operation < 0.35:
+            position = rng.randint(-len(expected), len(expected))
+            array.insert(position, step)
+            expected.insert(position, step)
+        elif operation < 0.45:
+            array.append(step)
+            expected.append(step)
+        elif operation < 0.75 and expected:
+            position = rng.randrange(-len(expected), len(expected))
+            assert array.pop(position) == expected.pop(position)
+        elif expected:
+            position = rng.randrange(len(expected))
+            array[position] = -step
+            expected[position] = -step
+            assert array[position] == -step
+    assert array.tolist() == expected and list(array) == expected
+    assert len(array) == len(expected)
+    array.extend(range(30))
+    assert array[-1] == 29 and len(array) == len(expected) + 30
+
+
+def test_mapped_array_survives_reopen(tmp_path):
+    path = str(tmp_path / "cuentas.bin")
+    array = MappedIntArray(path, range(3))
+    array.extend(range(3, 3000))
+    array.insert(0, -1)
+    array.insert(-1, -2)
+    assert array.pop(5) == 4
+    array[1] = 42
+    array.sort()
+    array.sorted = True
+    expected = array.tolist()
+    array.close()
+
+    reopened = MappedIntArray(path)
+    try:
+        assert reopened.tolist() == expected and len(reopened) == 3001
+        assert reopened.sorted
+        assert list(reopened) == expected
+    finally:
+        reopened.close()
+
+    with open(path, "r+b") as file:
+        file.write(b"XXXX")
+    with pytest.raises(ValueError):
+        MappedIntArray(path)
+
+
+def test_mapped_array_grows_while_iterating(tmp_path):
+    array = MappedIntArray(str(tmp_path / "cuentas.bin"), range(10))
+    try:
+        iterator = iter(array)
+        next(iterator)
+        array.extend(range(5000))
+        assert len(array) == 5010
+        assert next(iterator) == 1
+    finally:
+        array.close()
+
+
+def test_mapped_array_rejects_values_beyond_int64(tmp_path):
+    array = MappedIntArray(str(tmp_path / "cuentas.bin"), range(5))
+    try:
+        with pytest.raises(OverflowError):
+            array.append(2 ** 63)
+        with pytest.raises(OverflowError):
+            array.insert(1, -2 ** 63 - 1)
+        with pytest.raises(OverflowError):
+            array.extend([7, 2 ** 64])
+        with pytest.raises(OverflowError):
+            array[0] = 2 ** 63
+        assert array.tolist() == list(range(5))
+    finally:
+        array.close()
+
+
+def test_graph_rejects_duplicates_and_tracks_version():
+    graph = Graph()
+    assert graph.add_vertex("a") and graph.add_vertex("b") and not graph.add_vertex("a")
+    version = graph.version
+    assert graph.add_edge("a", "b", 4)
+    assert not graph.add_edge("b", "a", 9) and not graph.add_edge("a", "zz", 1)
+    assert graph.version == version + 1
+    assert graph.weight("b", "a") == 4 and graph.weight("a", "zz") is None
+    assert graph.edge_count() == 1 and list(graph.edges()) == [("a", "b", 4)]
+    assert graph.remove_edge("b", "a") and not graph.has_edge("a", "b")
+    assert graph.edge_count() == 0 and graph.degree("a") == 0
+
+
+def test_incremental_mst_matches_rebuild():
+    rng = random.Random(3)
+    for _ in range(100):
+        vertex_count = rng.randint(1, 20)
+        graph = Graph()
+        forest = MinimumSpanningForest()
+        for vertex in range(vertex_count):
+            graph.add_vertex(vertex)
+            forest.add_vertex(vertex)
+        for _ in range(rng.randint(0, 60)):
+            from_v, to_v = rng.randrange(vertex_count), rng.randrange(vertex_count)
+            weight = rng.randint(1, 20)
+            if from_v != to_v and graph.add_edge(from_v, to_v, weight):
+                forest.add_edge(from_v, to_v, weight)
+            rebuilt = MinimumSpanningForest(graph)
+            assert forest.total_weight == rebuilt.total_weight
+            assert forest.edge_count() == rebuilt.edge_count()
+            assert sum(weight for _, _, weight in forest.edges()) == forest.total_weight
+
+        rebuilt = MinimumSpanningForest(graph)
+        seeded = MinimumSpanningForest(graph, list(rebuilt.edges()))
+        assert seeded.total_weight == rebuilt.total_weight
+
+
+def test_union_find_matches_naive_sets():
+    rng = random.Random(1)
+    names = [f"isla{i}" for i in range(200)]
+    uf = UnionFind(names)
+    sets = {name: {name} for name in names}
+    for _ in range(150):
+        v1, v2 = rng.choice(names), rng.choice(names)
+        assert uf.union(v1, v2) == (sets[v1] is not sets[v2])
+        if sets[v1] is not sets[v2]:
+            merged = sets[v1] | sets[v2]
+            for name in merged:
+                sets[name] = merged
+    for v1 in names[:60]:
+        assert uf.find(v1) in sets[v1]
+        for v2 in names[:60]:
+            assert uf.connected(v1, v2) == (v2 in sets[v1])
+
+
+def test_union_find_long_chain_and_batches():
+    uf = UnionFind(range(100000))
+    for i in range(1, 100000):
+        uf.parent[i] = i - 1
+    assert uf.find(99999) == 0
+
+    uf = UnionFind(range(10))
+    assert uf.union_many([(0, 1), (1, 2), (0, 2), (5, 6)]) == 3
+    assert uf.connected(0, 2) and not uf.connected(2, 5)
@@ -0,0 +1,230 @@
+import heapq
+import math
+import random
+
+import pytest
+
+import grafos
+from grafos import MST_ENGINES, minimum_spanning_tree, choose_engine, kruskal, boruvka
+from estructuras import Graph, np
+
+
+def random_graph(seed, vertex_count, edge_count, max_weight=50):
+    rng = random.Random(seed)
+    graph = Graph()
+    for vertex in range(vertex_count):
+        graph.add_vertex(f"v{vertex}")
+    for _ in range(edge_count):
+        from_v, to_v = rng.randrange(vertex_count), rng.randrange(vertex_count)
+        if from_v != to_v:
+            graph.add_edge(f"v{from_v}", f"v{to_v}", rng.randint(1, max_weight))
+    return graph
+
+
+# Forest weight by brute force: Prim from scratch over every component
+def reference_mst_weight(graph):
+    seen = set()
+    total = 0
+    for start in graph:
+        if start in seen:
+            continue
+        seen.add(start)
+        frontier = dict(graph.neighbors(start))
+        while frontier:
+            vertex = min(frontier, key=frontier.get)
+            total += frontier.pop(vertex)
+            seen.add(vertex)
+            for neighbor, weight in graph.neighbors(vertex):
+                if neighbor not in seen and weight < frontier.get(neighbor, math.inf):
+                    frontier[neighbor] = weight
+    return total
+
+
+def is_forest(graph, edges):
+    parent = {vertex: vertex for vertex in graph}
+
+    def find(vertex):
+        while parent[vertex] != vertex:
+            vertex = parent[vertex]
+        return vertex
+
+    for from_v, to_v, weight in edges:
+        assert graph.weight(from_v, to_v) == weight
+        root1, root2 = find(from_v), find(to_v)
+        if root1 == root2:
+            return False
+        parent[root1] = root2
+    return True
+
+
+@pytest.mark.parametrize("engine", sorted(MST_ENGINES))
+def test_mst_engines_match_reference(engine):
+    for seed in range(60):
+        rng = random.Random(seed)
+        graph = random_graph(seed, rng.randint(1, 25), rng.randint(0, 80), rng.choice([3, 50]))
+        edges, total = MST_ENGINES[engine](graph)
+        assert total == reference_mst_weight(graph)
+        assert sum(weight for _, _, weight in edges) == total
+        assert is_forest(graph, edges)
+
+
+@pytest.mark.skipif(np is None, reason="Borůvka needs NumPy")
+def test_boruvka_on_large_maps_with_equal_weights():
+    for seed in range(3):
+        graph = random_graph(seed, 3000, 9000, max_weight=3)
+        edges, total = boruvka(graph)
+        assert total == kruskal(graph)[1]
+        assert len(edges) == len(kruskal(graph)[0]) and is_forest(graph, edges)
+
+
+def test_auto_engine():
+    sparse = random_graph(1, 200, 300)
+    dense = random_graph(2, 20, 150)
+    assert choose_engine(sparse) == "kruskal"
+    assert choose_engine(dense) == "prim"
+    large = random_graph(3, 3000, grafos.BORUVKA_MIN_EDGES + 100)
+    assert choose_engine(large) == ("boruvka" if np is not None else "kruskal")
+    engine, edges, total = minimum_spanning_tree(dense)
+    assert engine == "prim" and total == kruskal(dense)[1]
+    with pytest.raises(ValueError):
+        minimum_spanning_tree(dense, "reverse-delete")
+
+
+# Distances from source by a plain Dijkstra over the Graph
+def reference_distances(graph, source):
+    dist = {source: 0}
+    heap = [(0, source)]
+    while heap:
+        distance, vertex = heapq.heappop(heap)
+        if distance > dist[vertex]:
+            continue
+        for neighbor, weight in graph.neighbors(vertex):
+            if distance + weight < dist.get(neighbor, math.inf):
+                dist[neighbor] = distance + weight
+                heapq.heappush(heap, (distance + weight, neighbor))
+    return dist
+
+
+@pytest.mark.parametrize("engine", sorted(grafos.ALL_PAIRS_ENGINES))
+def test_all_pairs_match_reference(engine):
+    pytest.importorskip("numpy")
+    for seed in range(5):
+        graph = random_graph(seed, 30, 50)
+        vertices, matrix = grafos.ALL_PAIRS_ENGINES[engine](graph)
+        assert vertices == graph.vertices()
+        for i, source in enumerate(vertices):
+            dist = reference_distances(graph, source)
+            for j, target in enumerate(vertices):
+                assert matrix[i, j] == dist.get(target, math.inf)
+
+
+def test_all_pairs_dijkstra_process_pool(monkeypatch):
+    np = pytest.importorskip("numpy")
+    monkeypatch.setattr(grafos, "PARALLEL_MIN_VERTICES", 0)
+    graph = random_graph(7, 40, 80)
+    _, expected = grafos.floyd_warshall(graph)
+    _, matrix = grafos.all_pairs_dijkstra(graph, workers=2)
+    assert np.array_equal(matrix, expected)
+
+
+def test_all_pairs_dijkstra_releases_worker_csr():
+    pytest.importorskip("numpy")
+    grafos.all_pairs_dijkstra(random_graph(1, 10, 20), workers=1)
+    assert grafos._worker_csr is None
+
+
+def test_save_distance_matrix_reports_written_path(tmp_path):
+    np = pytest.importorskip("numpy")
+    graph = random_graph(2, 8, 12)
+    _, vertices, matrix = grafos.all_pairs_distances(graph)
+    path, names_path = grafos.save_distance_matrix(str(tmp_path / "distancias"), vertices, matrix)
+    assert path == str(tmp_path / "distancias.npy")
+    assert np.array_equal(np.load(path), matrix)
+    with open(names_path, encoding="utf-8") as file:
+        assert file.read().split() == vertices
+
+
+def test_import_edge_list_counts_rows(tmp_path):
+    path = tmp_path / "rutas.csv"
+    path.write_text("origen,destino,distancia\n"
+                    "a,b,3\n"
+                    " b , c , 4 \n"
+                    "a,b,9\n"
+                    "d\n"
+                    "\n"
+                    "a,a,1\n"
+                    "a,c,-2\n"
+                    "a,c,x\n"
+                    "a,c\n", encoding="utf-8")
+    graph = Graph()
+    stats = grafos.import_edge_list(graph, str(path), batch_size=2)
+    assert (stats.vertices, stats.edges, stats.duplicates, stats.invalid) == (4, 2, 1, 4)
+    assert stats.invalid_lines == [7, 8, 9, 10]
+    assert sorted(graph.vertices()) == ["a", "b", "c", "d"]
+    assert graph.weight("b", "c") == 4 and graph.weight("a", "b") == 3
+
+
+def test_import_edge_list_tsv(tmp_path):
+    path = tmp_path / "rutas.tsv"
+    path.write_text("a\tb\t1\nb\tc\t2\n", encoding="utf-8")
+    graph = Graph()
+    stats = grafos.import_edge_list(graph, str(path))
+    assert stats.edges == 2 and graph.has_edge("b", "c")
+
+
+def test_import_edge_list_rejects_a_bad_first_route(tmp_path):
+    path = tmp_path / "rutas.csv"
+    path.write_text("a,b,x\nb,c,2\n", encoding="utf-8")
+    graph = Graph()
+    graph.add_vertex("a")
+    stats = grafos.import_edge_list(graph, str(path))
+    assert (stats.edges, stats.invalid, stats.invalid_lines) == (1, 1, [1])
+
+    graph = Graph()
+    stats = grafos.import_edge_list(graph, str(path))
+    assert (stats.edges, stats.invalid) == (1, 0)
+
+
+def test_import_edge_list_keeps_rows_before_an_error(tmp_path):
+    path = tmp_path / "rutas.csv"
+    rows = "".join(f"v{i},v{i + 1},1\n" for i in range(20000))
+    path.write_bytes(rows.encode() + b"x\xff,y,2\n")
+    graph = Graph()
+    with pytest.raises(UnicodeDecodeError):
+        grafos.import_edge_list(graph, str(path), batch_size=1000)
+    assert 0 < graph.edge_count() <= 20000
+
+
+def check_route(graph, source, target, distance, path):
+    expected = reference_distances(graph, source).get(target, math.inf)
+    assert distance == expected
+    if expected == math.inf:
+        assert path is None
+        return
+    assert path[0] == source and path[-1] == target
+    assert sum(graph.weight(u, v) for u, v in zip(path, path[1:])) == distance
+
+
+def test_bidirectional_dijkstra_matches_reference():
+    for seed in range(10):
+        graph = random_graph(seed, 40, 60)
+        rng = random.Random(seed)
+        vertices = graph.vertices()
+        for _ in range(30):
+            source, target = rng.choice(vertices), rng.choice(vertices)
+            check_route(graph, source, target, *grafos.bidirectional_dijkstra(graph, source, target))
+
+
+def test_route_cache_reuses_trees_and_drops_them_on_change():
+    graph = random_graph(11, 60, 120)
+    cache = grafos.ShortestPathCache(graph)
+    rng = random.Random(11)
+    vertices = graph.vertices()
+    for _ in range(200):
+        source, target = rng.choice(vertices[:5]), rng.choice(vertices)
+        check_route(graph, source, target, *cache.route(source, target))
+    assert 0 < len(cache.trees) <= cache.MAX_TREES
+
+    assert graph.add_edge(vertices[0], vertices[-1], 1)
+    check_route(graph, vertices[0], vertices[-1], *cache.route(vertices[0], vertices[-1]))
+    assert cache.route(vertices[0], vertices[-1]) == (1, [vertices[0], vertices[-1]])
@@ -0,0 +1,122 @@
+import os
+import random
+import time
+
+import pytest
+
+from estructuras import Stack, Queue, Tree, AVLTree, CompactTree, IndexedCircularList, Graph
+from persistencia import PersistentStore, Journal, dump_state
+
+
+def reopen(tmp_path, name, factory, **options):
+    return PersistentStore(name, factory, directory=str(tmp_path), **options)
+
+
+def test_stack_and_queue_survive_restart(tmp_path):
+    stack = reopen(tmp_path, "pila", Stack, snapshot_every=7)
+    queue = reopen(tmp_path, "cola", lambda: Queue(5, Queue.OVERWRITE), snapshot_every=5)
+    rng = random.Random(1)
+    for i in range(100):
+        stack.apply("push", i) if rng.random() < 0.7 else stack.apply("pop")
+        queue.apply("enqueue", i) if rng.random() < 0.6 else queue.apply("dequeue")
+    expected_stack = list(stack.structure.stack)
+    expected_queue = list(queue.structure.queue)
+    stack.close()
+    queue.close()
+
+    stack = reopen(tmp_path, "pila", Stack)
+    queue = reopen(tmp_path, "cola", Queue)
+    assert list(stack.structure.stack) == expected_stack
+    assert list(queue.structure.queue) == expected_queue
+    assert queue.structure.capacity == 5
+
+
+@pytest.mark.parametrize("tree_class", [Tree, AVLTree, CompactTree])
+def test_tree_recovers_from_snapshot_and_journal(tmp_path, tree_class):
+    store = reopen(tmp_path, "arbol", tree_class, snapshot_every=13)
+    rng = random.Random(2)
+    for _ in range(200):
+        if rng.random() < 0.7:
+            store.apply("insert", rng.randrange(100))
+        else:
+            store.apply("delete", rng.randrange(100))
+    expected = store.structure.layout()
+    store.close()
+
+    recovered = reopen(tmp_path, "arbol", Tree).structure
+    assert type(recovered) is tree_class
+    assert recovered.layout() == expected
+
+
+def test_degenerate_tree_reloads_with_the_same_shape(tmp_path):
+    store = reopen(tmp_path, "arbol", Tree)
+    for value in range(2000):
+        store.structure.insert(value)
+    store.snapshot()
+    store.close()
+
+    recovered = reopen(tmp_path, "arbol", Tree).structure
+    assert recovered.layout() == store.structure.layout()
+    assert recovered.getHeight(recovered.root, 0) == 1999
+    assert recovered.size() == 2000
+
+
+def test_list_and_graph_survive_restart(tmp_path):
+    books = reopen(tmp_path, "prestamos", IndexedCircularList, snapshot_every=9)
+    graph = reopen(tmp_path, "grafo", Graph, snapshot_every=9)
+    for i in range(40):
+        books.apply("push", f"libro{i}")
+        books.apply("insert_at", 0, f"nuevo{i}")
+        graph.apply("add_vertex", i)
+        if i:
+            graph.apply("add_edge", i, i - 1, i)
+    books.apply("delete_at", 5)
+    expected_books = books.structure.traverse()
+    expected_edges = sorted(graph.structure.edges())
+    books.close()
+    graph.close()
+
+    assert reopen(tmp_path, "prestamos", IndexedCircularList).structure.traverse() == expected_books
+    assert sorted(reopen(tmp_path, "grafo", Graph).structure.edges()) == expected_edges
+
+
+def test_failing_operation_is_not_journaled(tmp_path):
+    store = reopen(tmp_path, "grafo", Graph)
+    store.apply("add_vertex", "A")
+    with pytest.raises(AttributeError):
+        store.apply("no_such_operation")
+    store.apply("add_vertex", "B")
+    store.close()
+
+    records = [operation for _, operation, _ in Journal.read(store.journal_path)]
+    assert records == ["add_vertex", "add_vertex"]
+    assert reopen(tmp_path, "grafo", Graph).structure.vertices() == ["A", "B"]
+
+
+def test_torn_journal_tail_is_dropped(tmp_path):
+    store = reopen(tmp_path, "pila", Stack)
+    for i in range(5):
+        store.apply("push", i)
+    store.close()
+    size = os.path.getsize(store.journal_path)
+    with open(store.journal_path, "ab") as file:
+        file.write(b"\x10\x00\x00\x00partial")
+
+    assert list(reopen(tmp_path, "pila", Stack).structure.stack) == list(range(5))
+    assert os.path.getsize(store.journal_path) == size
+
+
+def test_idle_journal_is_synced_by_timer(tmp_path):
+    journal = Journal(str(tmp_path / "j.journal"), sync_every=100, sync_interval=0.05)
+    journal.append(1, "push", (1,))
+    assert journal.pending == 1
+    deadline = time.monotonic() + 2
+    while journal.pending and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert journal.pending == 0
+    journal.close()
+
+
+def test_dump_state_rejects_unknown_structures():
+    with pytest.raises(TypeError):
+        dump_state(object())